@@ -7,6 +7,11 @@ SecureSimLab - A framework for educational security testing and system monitorin
 
 from .ransomware_simulator import RansomwareSimulator
 from .system_monitor import SystemMonitor
+from .metrics_buffer import MetricsBuffer
+from .columnar_export import ColumnarExporter, load_table
+from .aggregator import MetricsAggregator
+from .monitor_agent import MonitorAgent
+from .integrity import IntegrityVerifier
 from .simulator_gui import SimulatorGUI
 
 __version__ = '1.0.0'
@@ -26,5 +31,11 @@ def get_version():
 __all__ = [
     'RansomwareSimulator',
     'SystemMonitor',
+    'MetricsBuffer',
+    'ColumnarExporter',
+    'load_table',
+    'MetricsAggregator',
+    'MonitorAgent',
+    'IntegrityVerifier',
     'SimulatorGUI'
 ]
\ No newline at end of file
@@ -0,0 +1,285 @@
+# SecureSimLab - Agregador de Monitoreo
+# Archivo: aggregator.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import argparse
+import asyncio
+import json
+import logging
+import struct
+import zlib
+from datetime import datetime
+
+try:
+    from .system_monitor import SystemMonitor
+    from .metrics_buffer import MetricsBuffer
+except ImportError:
+    from system_monitor import SystemMonitor
+    from metrics_buffer import MetricsBuffer
+
+# Cabecera de cada trama: longitud del cuerpo comprimido (4 bytes, big-endian)
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# Tamaño máximo del cuerpo ya descomprimido
+MAX_DECOMPRESSED_SIZE = 256 * 1024 * 1024
+
+def encode_frame(message):
+    """
+    Serializa un mensaje como trama JSON comprimida con zlib
+
+    Args:
+        message (dict): Mensaje a enviar
+    """
+    body = zlib.compress(json.dumps(message, separators=(',', ':')).encode('utf-8'))
+    return FRAME_HEADER.pack(len(body)) + body
+
+def decode_frame(body: bytes):
+    """
+    Deserializa el cuerpo de una trama
+
+    Args:
+        body (bytes): Cuerpo comprimido, sin cabecera
+    """
+    # Limitar la descompresión: una trama pequeña podría expandirse a gigabytes
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(body, MAX_DECOMPRESSED_SIZE)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Trama descomprimida demasiado grande: más de {MAX_DECOMPRESSED_SIZE} bytes")
+    return json.loads(data.decode('utf-8'))
+
+EVENT_FIELDS = ('timestamp', 'event_type', 'description', 'severity')
+
+def validate_frame(frame):
+    """
+    Comprueba que una trama de agente tenga la forma esperada antes de
+    encolarla, para que una trama inválida no llegue a la escritura
+
+    Args:
+        frame (dict): Trama decodificada
+    """
+    if not isinstance(frame, dict):
+        raise ValueError("La trama no es un objeto")
+    if not isinstance(frame.get('host'), str) or not isinstance(frame.get('session'), str):
+        raise ValueError("La trama requiere host y session de texto")
+    if not isinstance(frame.get('seq'), int) or isinstance(frame['seq'], bool):
+        raise ValueError("La trama requiere un seq entero")
+
+    metrics = frame.get('metrics', [])
+    events = frame.get('events', [])
+    if not isinstance(metrics, list) or not isinstance(events, list):
+        raise ValueError("metrics y events deben ser listas")
+
+    for sample in metrics:
+        if not isinstance(sample, dict) or not isinstance(sample.get('timestamp'), str):
+            raise ValueError("Muestra sin timestamp")
+        datetime.fromisoformat(sample['timestamp'])
+        for field in MetricsBuffer.FIELDS:
+            value = sample.get(field)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ValueError(f"Muestra con {field} no numérico")
+
+    for event in events:
+        if not isinstance(event, dict) or not all(isinstance(event.get(field), str) for field in EVENT_FIELDS):
+            raise ValueError(f"Evento incompleto: se requieren {', '.join(EVENT_FIELDS)}")
+
+async def read_frame(reader):
+    """
+    Lee una trama de un stream asyncio; devuelve None si la conexión se cerró
+
+    Args:
+        reader (asyncio.StreamReader): Stream de lectura
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        (size,) = FRAME_HEADER.unpack(header)
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Trama demasiado grande: {size} bytes")
+        return decode_frame(await reader.readexactly(size))
+    except asyncio.IncompleteReadError:
+        return None
+
+class MetricsAggregator:
+    """
+    Servicio que recibe las tramas de métricas y eventos de varios agentes
+    (MonitorAgent) y las guarda, etiquetadas por host, en la base de datos
+    de un SystemMonitor compartido.
+
+    Cada conexión se atiende en su propia corrutina; una única tarea escribe
+    en SQLite agrupando las tramas pendientes, y cada trama se confirma al
+    agente solo después de quedar guardada. Cada trama se guarda en su propia
+    transacción y lleva (host, session, seq), de modo que un reenvío de una
+    trama ya guardada se confirma sin volver a insertarla.
+    """
+
+    def __init__(self, monitor: SystemMonitor, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Inicializa el agregador.
+
+        Args:
+            monitor (SystemMonitor): Monitor cuya base de datos recibe los datos
+            host (str): Dirección de escucha
+            port (int): Puerto de escucha (0 = elegir uno libre)
+        """
+        self.monitor = monitor
+        self.host = host
+        self.port = port
+        self.server = None
+        self.queue = None
+        self.writer_task = None
+        # Streams de escritura de las conexiones abiertas
+        self.connections = set()
+        self.logger = logging.getLogger('MetricsAggregator')
+
+    async def start(self):
+        """Abre el puerto de escucha y arranca la tarea de escritura"""
+        self.queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.write_batches())
+        self.server = await asyncio.start_server(self.handle_agent, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.logger.info(f"Agregador escuchando en {self.host}:{self.port}")
+
+    async def stop(self):
+        """
+        Cierra el puerto de escucha, las conexiones abiertas y la tarea de
+        escritura. Las tramas aún no guardadas fallan sin confirmarse, de modo
+        que los agentes las reenvían al reconectar.
+        """
+        self.server.close()
+        for writer in list(self.connections):
+            writer.close()
+
+        self.writer_task.cancel()
+        try:
+            await self.writer_task
+        except asyncio.CancelledError:
+            pass
+
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        self.fail(pending, ConnectionAbortedError("Agregador detenido"))
+
+        await self.server.wait_closed()
+        self.logger.info("Agregador detenido")
+
+    async def serve_forever(self):
+        """Arranca el agregador y lo mantiene activo hasta ser cancelado"""
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def handle_agent(self, reader, writer):
+        """
+        Atiende la conexión persistente de un agente
+
+        Args:
+            reader (asyncio.StreamReader): Stream de lectura
+            writer (asyncio.StreamWriter): Stream de escritura
+        """
+        peer = writer.get_extra_info('peername')
+        loop = asyncio.get_running_loop()
+        self.connections.add(writer)
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                validate_frame(frame)
+
+                stored = loop.create_future()
+                await self.queue.put((frame, stored))
+                await stored
+
+                writer.write(encode_frame({'ack': frame['seq']}))
+                await writer.drain()
+
+        except Exception as e:
+            self.logger.error(f"Error con el agente {peer}: {str(e)}")
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    async def write_batches(self):
+        """Guarda en la base de datos las tramas recibidas, en lotes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+
+            frames = [frame for frame, _ in pending]
+            try:
+                errors = await loop.run_in_executor(None, self.ingest, frames)
+            except asyncio.CancelledError:
+                # Las tramas ya guardadas se descartarán cuando el agente las reenvíe
+                self.fail(pending, ConnectionAbortedError("Agregador detenido"))
+                raise
+
+            # Resolver cada trama según su propio resultado
+            for (_, stored), error in zip(pending, errors):
+                if stored.done():
+                    continue
+                if error is None:
+                    stored.set_result(True)
+                else:
+                    stored.set_exception(error)
+
+    @staticmethod
+    def fail(pending, error):
+        """
+        Marca como fallidas las tramas pendientes, sin confirmarlas
+
+        Args:
+            pending (list): Pares (trama, futuro de guardado)
+            error (Exception): Error entregado a cada conexión en espera
+        """
+        for _, stored in pending:
+            if not stored.done():
+                stored.set_exception(error)
+
+    def ingest(self, frames):
+        """
+        Guarda un conjunto de tramas, cada una en su propia transacción
+
+        Args:
+            frames (list): Tramas con session, seq, host, metrics y events
+
+        Returns:
+            list: Por cada trama, None si quedó guardada o el error que lo impidió
+        """
+        errors = []
+        for frame in frames:
+            try:
+                stored = self.monitor.ingest_batch(
+                    frame['host'], frame.get('metrics', []), frame.get('events', []),
+                    frame=(frame['session'], frame['seq'])
+                )
+                if not stored:
+                    self.logger.info(
+                        f"Trama {frame['seq']} de {frame['host']} ya guardada: se confirma sin insertarla"
+                    )
+                errors.append(None)
+            except Exception as e:
+                self.logger.error(f"Error al guardar la trama {frame['seq']} de {frame['host']}: {str(e)}")
+                errors.append(e)
+        return errors
+
+def main():
+    """Ejecuta el agregador desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Agregador de monitoreo de SecureSimLab")
+    parser.add_argument('--bind', default='127.0.0.1', help="Dirección de escucha")
+    parser.add_argument('--port', type=int, default=8765, help="Puerto de escucha")
+    parser.add_argument('--db', default='data/monitor.db', help="Base de datos compartida")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    aggregator = MetricsAggregator(SystemMonitor(args.db), args.bind, args.port)
+    try:
+        asyncio.run(aggregator.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+# SecureSimLab - Exportación Columnar
+# Archivo: columnar_export.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import os
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Tipos de columna soportados y su representación en NumPy
+NUMPY_TYPES = {
+    'int': 'i8',
+    'float': 'f8',
+    'bool': '?',
+    'datetime': 'datetime64[us]'
+}
+
+class ColumnarExporter:
+    """
+    Exporta tablas de monitoreo a formato columnar para análisis offline.
+
+    Usa Parquet cuando pyarrow está instalado y, si no, un directorio de
+    arreglos .npy por columna que puede abrirse con np.load(mmap_mode='r').
+    Cada exportación escribe una nueva parte por tabla, en bloques de tamaño
+    fijo, y recuerda hasta dónde llegó para exportar solo lo nuevo la próxima vez.
+    Las partes se escriben con un nombre temporal y se renombran al
+    completarse, justo antes de guardar el progreso de su tabla, de modo que
+    una exportación interrumpida no deja partes sin registrar.
+    """
+
+    STATE_FILE = 'export_state.json'
+
+    def __init__(self, output_dir: str, chunk_size: int = 50000, use_parquet: bool = None):
+        """
+        Inicializa el exportador.
+
+        Args:
+            output_dir (str): Directorio de salida
+            chunk_size (int): Filas leídas y escritas por bloque
+            use_parquet (bool): Forzar o desactivar Parquet; por defecto si pyarrow está disponible
+        """
+        if use_parquet and pa is None:
+            raise ValueError("Parquet requiere tener instalado pyarrow")
+
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.use_parquet = pa is not None if use_parquet is None else use_parquet
+        self.format = 'parquet' if self.use_parquet else 'numpy'
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.state = self.load_state()
+
+    def load_state(self):
+        """Carga el progreso de exportaciones anteriores"""
+        state_path = self.output_dir / self.STATE_FILE
+        if not state_path.exists():
+            return {}
+        with open(state_path, 'r') as f:
+            return json.load(f)
+
+    def save_state(self):
+        """Guarda el progreso de la exportación"""
+        with open(self.output_dir / self.STATE_FILE, 'w') as f:
+            json.dump(self.state, f, indent=4)
+
+    def reset(self, table: str):
+        """
+        Elimina las partes exportadas de una tabla y su progreso
+
+        Args:
+            table (str): Nombre de la tabla
+        """
+        shutil.rmtree(self.output_dir / table, ignore_errors=True)
+        self.state.pop(table, None)
+
+    def export_table(self, conn, table: str, columns):
+        """
+        Exporta las filas de una tabla SQLite posteriores a la última exportación
+
+        Args:
+            conn (sqlite3.Connection): Conexión abierta
+            table (str): Nombre de la tabla (con clave primaria 'id')
+            columns (list): Pares (nombre, tipo) en el orden a exportar
+
+        Returns:
+            int: Número de filas exportadas
+        """
+        cursor = conn.cursor()
+        last_id = self.state.get(table, 0)
+
+        # Fijar el límite superior para que las filas nuevas queden para la próxima vez
+        cursor.execute(f'SELECT COUNT(*), MAX(id) FROM {table} WHERE id > ?', (last_id,))
+        count, max_id = cursor.fetchone()
+        if not count:
+            return 0
+
+        widths = self._string_widths(cursor, table, columns, last_id, max_id)
+        names = [name for name, _ in columns]
+        id_index = names.index('id')
+        part = self._open_part(table, columns, count, widths)
+
+        try:
+            after = last_id
+            while after < max_id:
+                cursor.execute(f'''
+                    SELECT {', '.join(names)} FROM {table}
+                    WHERE id > ? AND id <= ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (after, max_id, self.chunk_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                part.write(rows)
+                after = rows[-1][id_index]
+            part.close()
+        except Exception:
+            part.discard()
+            raise
+
+        part.commit()
+        self.state[table] = max_id
+        self.save_state()
+        return part.rows
+
+    def export_records(self, table: str, records, columns):
+        """
+        Exporta una lista de registros (diccionarios) como una nueva parte.
+        El progreso de estos registros lo guarda quien llama, tras el retorno.
+
+        Args:
+            table (str): Nombre de la tabla de salida
+            records (list): Registros a exportar
+            columns (list): Pares (nombre, tipo) en el orden a exportar
+
+        Returns:
+            int: Número de filas exportadas
+        """
+        if not records:
+            return 0
+
+        rows = [tuple(record.get(name) for name, _ in columns) for record in records]
+        widths = {
+            name: max(1, max(len(str(row[i] or '')) for row in rows))
+            for i, (name, kind) in enumerate(columns) if kind == 'str'
+        }
+        part = self._open_part(table, columns, len(rows), widths)
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                part.write(rows[start:start + self.chunk_size])
+            part.close()
+        except Exception:
+            part.discard()
+            raise
+
+        part.commit()
+        return part.rows
+
+    def _string_widths(self, cursor, table, columns, last_id, max_id):
+        """Ancho máximo de cada columna de texto en el rango a exportar"""
+        text_columns = [name for name, kind in columns if kind == 'str']
+        if not text_columns:
+            return {}
+
+        lengths = ', '.join(f'MAX(LENGTH({name}))' for name in text_columns)
+        cursor.execute(f'SELECT {lengths} FROM {table} WHERE id > ? AND id <= ?', (last_id, max_id))
+        return {name: max(1, width or 0) for name, width in zip(text_columns, cursor.fetchone())}
+
+    def _open_part(self, table, columns, count, widths):
+        """Crea la siguiente parte de la tabla en el formato configurado"""
+        table_dir = self.output_dir / table
+        os.makedirs(table_dir, exist_ok=True)
+        number = len(list(table_dir.glob('part-*'))) + 1
+        path = table_dir / f'part-{number:05d}'
+        # Nombre oculto mientras se escribe: load_table y la numeración solo ven 'part-*'
+        temp_path = table_dir / f'.tmp-part-{number:05d}'
+
+        if self.use_parquet:
+            return ParquetPart(path.with_suffix('.parquet'), temp_path.with_suffix('.parquet'), columns)
+        return NumpyPart(path, temp_path, columns, count, widths)
+
+def _remove(path: Path):
+    """Elimina un archivo o directorio si existe"""
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+class ColumnarPart:
+    """
+    Base de las partes de una tabla: se escriben en temp_path y commit() las
+    renombra a path una vez completas
+    """
+
+    def __init__(self, path: Path, temp_path: Path, columns):
+        self.path = path
+        self.temp_path = temp_path
+        self.columns = columns
+        self.rows = 0
+        # Restos de una exportación interrumpida con el mismo número de parte
+        _remove(temp_path)
+
+    def commit(self):
+        """Publica la parte con su nombre definitivo"""
+        os.replace(self.temp_path, self.path)
+
+    def discard(self):
+        """Elimina una parte incompleta"""
+        try:
+            self.close()
+        except Exception:
+            pass
+        _remove(self.temp_path)
+
+class ParquetPart(ColumnarPart):
+    """Parte de una tabla escrita como archivo Parquet, un grupo de filas por bloque"""
+
+    ARROW_TYPES = {
+        'int': 'int64',
+        'float': 'float64',
+        'bool': 'bool_',
+        'str': 'string'
+    }
+
+    def __init__(self, path: Path, temp_path: Path, columns):
+        super().__init__(path, temp_path, columns)
+        fields = []
+        for name, kind in columns:
+            if kind == 'datetime':
+                fields.append(pa.field(name, pa.timestamp('us')))
+            else:
+                fields.append(pa.field(name, getattr(pa, self.ARROW_TYPES[kind])()))
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(str(temp_path), self.schema)
+
+    def write(self, rows):
+        """Escribe un bloque de filas"""
+        arrays = []
+        for index, (name, kind) in enumerate(self.columns):
+            values = [row[index] for row in rows]
+            if kind == 'datetime':
+                values = np.array(values, dtype=NUMPY_TYPES[kind])
+            arrays.append(pa.array(values, type=self.schema.field(name).type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self.writer.close()
+
+class NumpyPart(ColumnarPart):
+    """
+    Parte de una tabla escrita como un archivo .npy por columna. Los archivos
+    se crean con su tamaño final y se rellenan por bloques mediante memmap.
+    """
+
+    def __init__(self, path: Path, temp_path: Path, columns, count: int, widths):
+        super().__init__(path, temp_path, columns)
+        os.makedirs(temp_path)
+
+        self.arrays = {}
+        for name, kind in columns:
+            dtype = f'U{widths[name]}' if kind == 'str' else NUMPY_TYPES[kind]
+            self.arrays[name] = np.lib.format.open_memmap(
+                str(temp_path / f'{name}.npy'), mode='w+', dtype=dtype, shape=(count,)
+            )
+
+    def write(self, rows):
+        """Escribe un bloque de filas"""
+        end = self.rows + len(rows)
+        for index, (name, kind) in enumerate(self.columns):
+            values = [row[index] for row in rows]
+            if kind == 'str':
+                values = ['' if value is None else value for value in values]
+            self.arrays[name][self.rows:end] = np.array(values, dtype=self.arrays[name].dtype)
+        self.rows = end
+
+    def close(self):
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+
+def load_table(output_dir: str, table: str):
+    """
+    Carga todas las partes exportadas de una tabla sin copiar los datos
+
+    Con Parquet devuelve un pyarrow.Table leído con memory-map; con el formato
+    NumPy devuelve una lista (una por parte) de diccionarios columna -> memmap.
+
+    Args:
+        output_dir (str): Directorio de la exportación
+        table (str): Nombre de la tabla
+    """
+    table_dir = Path(output_dir) / table
+    parquet_parts = sorted(table_dir.glob('part-*.parquet'))
+    if parquet_parts:
+        if pa is None:
+            raise ValueError("Leer Parquet requiere tener instalado pyarrow")
+        return pa.concat_tables(
+            [pq.read_table(str(part), memory_map=True) for part in parquet_parts]
+        )
+
+    return [
+        {column.stem: np.load(column, mmap_mode='r') for column in sorted(part.glob('*.npy'))}
+        for part in sorted(table_dir.glob('part-*')) if part.is_dir()
+    ]
@@ -0,0 +1,90 @@
+# SecureSimLab - Reducción de Series Temporales
+# Archivo: downsampling.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+from collections import deque
+import numpy as np
+
+def lttb(rows, threshold: int, x_start: float, x_end: float, xy):
+    """
+    Reduce una serie ordenada con Largest-Triangle-Three-Buckets.
+
+    Trabaja en flujo: los cubos se definen por intervalos de tiempo iguales
+    entre x_start y x_end, y solo se mantienen en memoria dos cubos a la vez,
+    por lo que el consumo no depende del tamaño total del rango.
+
+    Args:
+        rows (iterable): Filas ordenadas por x
+        threshold (int): Número máximo de puntos a devolver (>= 3)
+        x_start (float): Valor x de la primera fila
+        x_end (float): Valor x de la última fila
+        xy (callable): Función que devuelve (x, y) para una fila
+
+    Yields:
+        Las filas seleccionadas, en orden
+    """
+    if threshold < 3:
+        raise ValueError(f"El umbral debe ser al menos 3: {threshold}")
+
+    buckets_count = threshold - 2
+    bucket_width = (x_end - x_start) / buckets_count
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    yield first
+
+    selected = xy(first)
+    # Cada cubo: [índice, xs, ys, filas]
+    buckets = deque()
+    held = None
+
+    for row in rows:
+        # Retener una fila para reconocer la última, que siempre se conserva
+        if held is not None:
+            x, y = xy(held)
+            index = int((x - x_start) / bucket_width) if bucket_width > 0 else 0
+            index = min(max(index, 0), buckets_count - 1)
+
+            if not buckets or buckets[-1][0] != index:
+                buckets.append([index, [], [], []])
+                # El penúltimo cubo está completo: resolver el anterior a él
+                if len(buckets) == 3:
+                    bucket = buckets.popleft()
+                    row_selected, selected = _select(bucket, selected, _average(buckets[0]))
+                    yield row_selected
+
+            buckets[-1][1].append(x)
+            buckets[-1][2].append(y)
+            buckets[-1][3].append(held)
+        held = row
+
+    if held is None:
+        return
+
+    last = xy(held)
+    while buckets:
+        bucket = buckets.popleft()
+        following = _average(buckets[0]) if buckets else last
+        row_selected, selected = _select(bucket, selected, following)
+        yield row_selected
+    yield held
+
+def _average(bucket):
+    """Punto medio (x, y) de un cubo"""
+    return sum(bucket[1]) / len(bucket[1]), sum(bucket[2]) / len(bucket[2])
+
+def _select(bucket, previous, following):
+    """
+    Elige la fila del cubo que forma el triángulo de mayor área con el punto
+    seleccionado anterior y el promedio del cubo siguiente
+    """
+    xs = np.asarray(bucket[1], dtype='f8')
+    ys = np.asarray(bucket[2], dtype='f8')
+    ax, ay = previous
+    cx, cy = following
+
+    areas = np.abs((ax - cx) * (ys - ay) - (ax - xs) * (cy - ay))
+    best = int(areas.argmax())
+    return bucket[3][best], (xs[best], ys[best])
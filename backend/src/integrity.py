@@ -0,0 +1,253 @@
+# SecureSimLab - Verificación de Integridad
+# Archivo: integrity.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+class IntegrityVerifier:
+    """
+    Compara un árbol de archivos con un respaldo usando un hash rápido no
+    criptográfico (xxHash si está instalado, si no BLAKE2b) calculado por
+    bloques en un pool de hilos.
+
+    Los hashes se guardan en una caché SQLite indexada por ruta y validada
+    por (tamaño, mtime), de modo que las verificaciones repetidas solo
+    recalculan los archivos que cambiaron.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_path: str = None, workers: int = None):
+        """
+        Inicializa el verificador.
+
+        Args:
+            cache_path (str): Base de datos de la caché de hashes; None la desactiva
+            workers (int): Hilos de cálculo; por defecto según las CPUs disponibles
+        """
+        self.cache_path = cache_path
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.algorithm = 'xxh3_128' if xxhash is not None else 'blake2b'
+        self.logger = logging.getLogger('IntegrityVerifier')
+        if cache_path:
+            self.setup_cache()
+
+    def setup_cache(self):
+        """Crea la tabla de la caché de hashes"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                algorithm TEXT,
+                digest TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def hash_file(self, path: str):
+        """
+        Calcula el hash de un archivo leyéndolo por bloques
+
+        Args:
+            path (str): Ruta del archivo
+        """
+        hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def scan(root: str):
+        """
+        Recorre un árbol y devuelve {ruta relativa: (tamaño, mtime_ns)}
+
+        Args:
+            root (str): Directorio raíz
+        """
+        files = {}
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        relative = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                        files[relative] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def verify(self, target_dir: str, backup_dir: str):
+        """
+        Compara el árbol objetivo con un respaldo
+
+        Args:
+            target_dir (str): Directorio restaurado a verificar
+            backup_dir (str): Directorio del respaldo de referencia
+
+        Returns:
+            dict: Resultado con archivos coincidentes, distintos, faltantes y sobrantes
+        """
+        started = time.perf_counter()
+        target_dir = os.path.abspath(target_dir)
+        backup_dir = os.path.abspath(backup_dir)
+
+        target_files = self.scan(target_dir)
+        backup_files = self.scan(backup_dir)
+
+        missing = sorted(set(backup_files) - set(target_files))
+        extra = sorted(set(target_files) - set(backup_files))
+        common = sorted(set(target_files) & set(backup_files))
+
+        # Un tamaño distinto ya es una diferencia: no hace falta calcular el hash
+        mismatched = [path for path in common if target_files[path][0] != backup_files[path][0]]
+        to_compare = [path for path in common if target_files[path][0] == backup_files[path][0]]
+
+        files = {}
+        for path in to_compare:
+            files[os.path.join(target_dir, path)] = target_files[path]
+            files[os.path.join(backup_dir, path)] = backup_files[path]
+        digests, hashed = self.hash_files(files, (target_dir, backup_dir))
+
+        for path in to_compare:
+            if digests[os.path.join(target_dir, path)] != digests[os.path.join(backup_dir, path)]:
+                mismatched.append(path)
+        mismatched.sort()
+
+        result = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'target_directory': target_dir,
+            'backup_directory': backup_dir,
+            'algorithm': self.algorithm,
+            'ok': not (mismatched or missing or extra),
+            'files_checked': len(common),
+            'matched': len(common) - len(mismatched),
+            'mismatched': mismatched,
+            'missing': missing,
+            'extra': extra,
+            'hashed': hashed,
+            'cached': len(files) - hashed,
+            'duration': time.perf_counter() - started
+        }
+        self.logger.info(
+            f"Verificación de {target_dir}: {result['matched']} coincidentes, "
+            f"{len(mismatched)} distintos, {len(missing)} faltantes, {len(extra)} sobrantes"
+        )
+        return result
+
+    def hash_files(self, files, roots):
+        """
+        Obtiene el hash de cada archivo, usando la caché cuando tamaño y mtime coinciden
+
+        Args:
+            files (dict): {ruta absoluta: (tamaño, mtime_ns)}
+            roots (tuple): Directorios absolutos que contienen los archivos
+
+        Returns:
+            tuple: ({ruta: hash}, número de archivos recalculados)
+        """
+        cached = self.load_cache(files, roots) if self.cache_path else {}
+        digests = {}
+        to_hash = []
+        for path, (size, mtime_ns) in files.items():
+            entry = cached.get(path)
+            if entry is not None and entry[:3] == (size, mtime_ns, self.algorithm):
+                digests[path] = entry[3]
+            else:
+                to_hash.append(path)
+
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for path, digest in zip(to_hash, pool.map(self.hash_file, to_hash)):
+                    digests[path] = digest
+
+            if self.cache_path:
+                self.save_cache([
+                    (path, files[path][0], files[path][1], self.algorithm, digests[path])
+                    for path in to_hash
+                ])
+
+        return digests, len(to_hash)
+
+    def load_cache(self, files, roots):
+        """
+        Lee de la caché las entradas de los archivos indicados y elimina las
+        de archivos de esos directorios que ya no existen
+
+        Args:
+            files (dict): {ruta absoluta: (tamaño, mtime_ns)}
+            roots (tuple): Directorios absolutos que contienen los archivos
+        """
+        conn = sqlite3.connect(self.cache_path)
+        try:
+            cursor = conn.cursor()
+            cached = {}
+            stale = []
+            for root in set(roots):
+                # Rango de la clave primaria con las rutas bajo el directorio
+                prefix = os.path.join(root, '')
+                cursor.execute('''
+                    SELECT path, size, mtime_ns, algorithm, digest FROM file_hashes
+                    WHERE path >= ? AND path < ?
+                ''', (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+                for row in cursor.fetchall():
+                    if row[0] in files:
+                        cached[row[0]] = row[1:]
+                    elif not os.path.lexists(row[0]):
+                        stale.append((row[0],))
+
+            if stale:
+                cursor.executemany('DELETE FROM file_hashes WHERE path = ?', stale)
+                conn.commit()
+            return cached
+        finally:
+            conn.close()
+
+    def save_cache(self, entries):
+        """Guarda en la caché los hashes recalculados"""
+        conn = sqlite3.connect(self.cache_path)
+        try:
+            conn.executemany('''
+                INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, algorithm, digest)
+                VALUES (?, ?, ?, ?, ?)
+            ''', entries)
+            conn.commit()
+        finally:
+            conn.close()
+
+def main():
+    """Verifica un árbol contra un respaldo desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Verificación de integridad de SecureSimLab")
+    parser.add_argument('target', help="Directorio a verificar")
+    parser.add_argument('backup', help="Directorio del respaldo")
+    parser.add_argument('--cache', default=None, help="Base de datos de la caché de hashes")
+    parser.add_argument('--workers', type=int, default=None, help="Hilos de cálculo")
+    args = parser.parse_args()
+
+    result = IntegrityVerifier(args.cache, args.workers).verify(args.target, args.backup)
+    print(json.dumps(result, indent=4))
+    raise SystemExit(0 if result['ok'] else 1)
+
+if __name__ == "__main__":
+    main()
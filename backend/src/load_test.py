@@ -0,0 +1,399 @@
+# SecureSimLab - Pruebas de Carga de la API
+# Archivo: load_test.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import importlib
+import subprocess
+from contextlib import AsyncExitStack
+from pathlib import Path
+import numpy as np
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Directorio backend/ (contiene el paquete src con la aplicación FastAPI)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Peticiones disponibles para la mezcla de carga: nombre -> (método, ruta)
+ENDPOINTS = {
+    'metrics': ('GET', '/api/metrics'),
+    'history': ('GET', '/api/metrics/history'),
+    'events': ('GET', '/api/events'),
+    'hosts': ('GET', '/api/hosts'),
+    'start': ('POST', '/api/simulation/start'),
+    'stop': ('POST', '/api/simulation/stop'),
+    'backups': ('GET', '/api/simulation/backups'),
+    'verify': ('POST', '/api/simulation/verify'),
+    'report': ('POST', '/api/report/generate')
+}
+
+# Respuestas esperadas que no cuentan como error: la mezcla aleatoria pide
+# iniciar y detener la simulación sin seguir su estado, así que un 409 (ya en
+# curso / no activa) es la respuesta correcta; un fallo del simulador es un 500
+EXPECTED_STATUS = {
+    'start': {409},
+    'stop': {409}
+}
+
+DEFAULT_CONFIG = {
+    'mode': 'inprocess',
+    'clients': 20,
+    'duration': 20,
+    'warmup': 2,
+    'think_time': 0,
+    'seed': 0,
+    'port': 0,
+    'mix': {
+        'metrics': 80,
+        'start': 5,
+        'stop': 5,
+        'report': 10
+    },
+    'slo': {
+        'overall': {},
+        'endpoints': {}
+    }
+}
+
+# Umbrales admitidos en 'slo': latencias en milisegundos, tasa de error y throughput
+SLO_KEYS = ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'error_rate', 'min_rps')
+
+def load_config(path: str = None):
+    """
+    Lee la configuración de la prueba (YAML o JSON) sobre los valores por defecto
+
+    Args:
+        path (str): Ruta del archivo de configuración; None usa los valores por defecto
+    """
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    if path is None:
+        return config
+
+    with open(path, 'r') as f:
+        if Path(path).suffix in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ValueError("Leer configuración YAML requiere tener instalado PyYAML")
+            overrides = yaml.safe_load(f) or {}
+        else:
+            overrides = json.load(f)
+
+    for key, value in overrides.items():
+        if key == 'slo':
+            config['slo']['overall'].update(value.get('overall', {}))
+            config['slo']['endpoints'].update(value.get('endpoints', {}))
+        else:
+            config[key] = value
+    return config
+
+def validate_config(config):
+    """Comprueba la mezcla de peticiones y los umbrales configurados"""
+    if config['mode'] not in ('inprocess', 'uvicorn'):
+        raise ValueError(f"Modo desconocido: {config['mode']}")
+    unknown = set(config['mix']) - set(ENDPOINTS)
+    if unknown:
+        raise ValueError(f"Peticiones desconocidas en la mezcla: {', '.join(sorted(unknown))}")
+    if not any(weight > 0 for weight in config['mix'].values()):
+        raise ValueError("La mezcla de peticiones está vacía")
+
+    thresholds = [config['slo']['overall']] + list(config['slo']['endpoints'].values())
+    for threshold in thresholds:
+        unknown = set(threshold) - set(SLO_KEYS)
+        if unknown:
+            raise ValueError(f"Umbrales SLO desconocidos: {', '.join(sorted(unknown))}")
+
+def prepare_workdir():
+    """
+    Crea un directorio de trabajo aislado para la aplicación, con una copia
+    de los archivos de prueba, para que la carga no toque los datos del repositorio
+    """
+    workdir = Path(tempfile.mkdtemp(prefix='securesimlab_load_'))
+    os.makedirs(workdir / 'logs')
+    shutil.copytree(BACKEND_DIR / 'data' / 'test_files', workdir / 'data' / 'test_files')
+    return workdir
+
+def import_app():
+    """Importa la aplicación FastAPI de main.py"""
+    # src/__init__.py importa la GUI, que usa importaciones absolutas desde src/
+    for path in (str(BACKEND_DIR / 'src'), str(BACKEND_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    return importlib.import_module('src.main').app
+
+def free_port():
+    """Devuelve un puerto TCP libre en localhost"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class LoadTest:
+    """
+    Genera carga contra la API con muchos clientes asíncronos concurrentes,
+    cada uno enviando peticiones de la mezcla configurada en bucle cerrado,
+    y resume throughput y latencias (p50/p95/p99) por petición.
+    """
+
+    def __init__(self, config):
+        """
+        Inicializa la prueba.
+
+        Args:
+            config (dict): Configuración (ver DEFAULT_CONFIG)
+        """
+        if httpx is None:
+            raise ValueError("Las pruebas de carga requieren tener instalado httpx")
+        validate_config(config)
+
+        self.config = config
+        self.names = [name for name, weight in config['mix'].items() if weight > 0]
+        self.weights = [config['mix'][name] for name in self.names]
+        # Por petición: listas de latencias (s) y número de errores
+        self.latencies = {name: [] for name in self.names}
+        self.errors = {name: 0 for name in self.names}
+        self.measured_time = 0.0
+
+    def run(self):
+        """Ejecuta la prueba en el modo configurado y devuelve el resumen"""
+        workdir = prepare_workdir()
+        previous_dir = os.getcwd()
+        server = None
+        try:
+            if self.config['mode'] == 'uvicorn':
+                port = self.config['port'] or free_port()
+                server = self.start_server(workdir, port)
+                base_url = f'http://127.0.0.1:{port}'
+                app = None
+            else:
+                os.chdir(workdir)
+                base_url = 'http://testserver'
+                app = import_app()
+
+            asyncio.run(self.generate_load(base_url, app))
+
+        finally:
+            os.chdir(previous_dir)
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        return self.summarize()
+
+    def start_server(self, workdir: Path, port: int):
+        """Arranca la aplicación con uvicorn en localhost y espera a que responda"""
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [str(BACKEND_DIR / 'src'), str(BACKEND_DIR), env.get('PYTHONPATH', '')]
+        )
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'src.main:app',
+             '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+            cwd=workdir, env=env
+        )
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError("El servidor uvicorn terminó al arrancar")
+            try:
+                httpx.get(f'http://127.0.0.1:{port}/api/hosts', timeout=1)
+                return server
+            except httpx.TransportError:
+                time.sleep(0.2)
+
+        server.terminate()
+        raise RuntimeError("El servidor uvicorn no respondió a tiempo")
+
+    async def generate_load(self, base_url: str, app=None):
+        """
+        Lanza los clientes concurrentes durante el calentamiento y la medición
+
+        Args:
+            base_url (str): URL base de la API
+            app: Aplicación ASGI a la que enviar las peticiones en el mismo proceso
+        """
+        limits = httpx.Limits(max_connections=self.config['clients'])
+        async with AsyncExitStack() as stack:
+            transport = None
+            if app is not None:
+                # ASGITransport no emite los eventos lifespan: arrancar y detener la app aquí
+                await stack.enter_async_context(app.router.lifespan_context(app))
+                transport = httpx.ASGITransport(app=app)
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60)
+            )
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            measure_from = started + self.config['warmup']
+            stop_at = measure_from + self.config['duration']
+
+            await asyncio.gather(*[
+                self.client_loop(client, random.Random(self.config['seed'] + index),
+                                 measure_from, stop_at)
+                for index in range(self.config['clients'])
+            ])
+            self.measured_time = max(loop.time() - measure_from, 1e-9)
+
+    async def client_loop(self, client, rng, measure_from: float, stop_at: float):
+        """Bucle de un cliente: elige una petición de la mezcla, la envía y mide"""
+        loop = asyncio.get_running_loop()
+        think_time = self.config['think_time']
+        while loop.time() < stop_at:
+            name = rng.choices(self.names, self.weights)[0]
+            method, path = ENDPOINTS[name]
+
+            sent = loop.time()
+            try:
+                response = await client.request(method, path)
+                failed = (response.status_code >= 400 and
+                          response.status_code not in EXPECTED_STATUS.get(name, ()))
+            except httpx.HTTPError:
+                failed = True
+            elapsed = loop.time() - sent
+
+            if sent >= measure_from:
+                self.latencies[name].append(elapsed)
+                if failed:
+                    self.errors[name] += 1
+
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    def summarize(self):
+        """Calcula las estadísticas por petición y globales y evalúa los SLO"""
+        endpoints = {
+            name: self.stats(self.latencies[name], self.errors[name])
+            for name in self.names
+        }
+        all_latencies = [latency for name in self.names for latency in self.latencies[name]]
+        overall = self.stats(all_latencies, sum(self.errors.values()))
+
+        violations = self.check_slo('overall', overall, self.config['slo']['overall'])
+        for name, thresholds in self.config['slo']['endpoints'].items():
+            if name in endpoints:
+                violations.extend(self.check_slo(name, endpoints[name], thresholds))
+
+        return {
+            'mode': self.config['mode'],
+            'clients': self.config['clients'],
+            'duration': self.measured_time,
+            'mix': self.config['mix'],
+            'overall': overall,
+            'endpoints': endpoints,
+            'slo': self.config['slo'],
+            'violations': violations,
+            'passed': not violations
+        }
+
+    def stats(self, latencies, errors: int):
+        """Throughput, tasa de error y percentiles de latencia (ms) de un conjunto de peticiones"""
+        count = len(latencies)
+        stats = {
+            'requests': count,
+            'errors': errors,
+            'error_rate': errors / count if count else 0.0,
+            'rps': count / self.measured_time if self.measured_time else 0.0
+        }
+        if count:
+            values = np.asarray(latencies) * 1000
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            stats.update({
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(values.max())
+            })
+        return stats
+
+    @staticmethod
+    def check_slo(name: str, stats, thresholds):
+        """Devuelve los umbrales incumplidos por unas estadísticas"""
+        violations = []
+        for key, limit in thresholds.items():
+            if key == 'min_rps':
+                value = stats['rps']
+                failed = value < limit
+            else:
+                value = stats.get(key)
+                failed = value is None or value > limit
+            if failed:
+                violations.append({'target': name, 'metric': key, 'value': value, 'limit': limit})
+        return violations
+
+def print_summary(summary):
+    """Muestra el resultado de la prueba como tabla"""
+    def fmt(value):
+        return '-' if value is None else f'{value:.1f}'
+
+    print(f"\n{'Petición':<12} {'Total':>8} {'Errores':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8}")
+    rows = list(summary['endpoints'].items()) + [('TOTAL', summary['overall'])]
+    for name, stats in rows:
+        print(
+            f"{name:<12} {stats['requests']:>8} {stats['errors']:>8} {fmt(stats['rps']):>8} "
+            f"{fmt(stats.get('p50_ms')):>8} {fmt(stats.get('p95_ms')):>8} "
+            f"{fmt(stats.get('p99_ms')):>8} {fmt(stats.get('max_ms')):>8}"
+        )
+
+    if summary['passed']:
+        print("\nSLO cumplidos")
+    else:
+        print("\nSLO incumplidos:")
+        for v in summary['violations']:
+            print(f"  {v['target']}: {v['metric']} = {fmt(v['value'])} (límite {v['limit']})")
+
+def parse_pairs(text: str):
+    """Convierte 'a=1,b=2' en {'a': 1.0, 'b': 2.0}"""
+    pairs = {}
+    for item in filter(None, text.split(',')):
+        key, _, value = item.partition('=')
+        pairs[key.strip()] = float(value)
+    return pairs
+
+def main():
+    """Ejecuta una prueba de carga desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Pruebas de carga de la API de SecureSimLab")
+    parser.add_argument('--config', default=None, help="Archivo YAML o JSON de configuración")
+    parser.add_argument('--mode', choices=('inprocess', 'uvicorn'), default=None)
+    parser.add_argument('--clients', type=int, default=None, help="Clientes concurrentes")
+    parser.add_argument('--duration', type=float, default=None, help="Segundos de medición")
+    parser.add_argument('--warmup', type=float, default=None, help="Segundos de calentamiento")
+    parser.add_argument('--mix', default=None, help="Pesos de la mezcla, p. ej. metrics=80,report=10")
+    parser.add_argument('--slo', default=None, help="Umbrales globales, p. ej. p95_ms=200,error_rate=0.01")
+    parser.add_argument('--output', default=None, help="Guardar el resumen en JSON")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    for key in ('mode', 'clients', 'duration', 'warmup'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    if args.mix:
+        config['mix'] = parse_pairs(args.mix)
+    if args.slo:
+        config['slo']['overall'].update(parse_pairs(args.slo))
+
+    summary = LoadTest(config).run()
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=4)
+    raise SystemExit(0 if summary['passed'] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from .ransomware_simulator import RansomwareSimulator
 from .system_monitor import SystemMonitor
 
-app = FastAPI()
+# Instanciar las clases
+monitor = SystemMonitor()
+simulator = RansomwareSimulator(
+    "./data/test_files", "./data/backup_files",
+    file_event_callback=monitor.record_file_event
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Monitorear mientras la aplicación está activa, haya o no simulación,
+    # para que el panel reciba métricas en vivo
+    monitor.start_monitoring()
+    yield
+    monitor.stop_monitoring()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configurar CORS
 app.add_middleware(
@@ -14,27 +30,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Instanciar las clases
-simulator = RansomwareSimulator("./data/test_files", "./data/backup_files")
-monitor = SystemMonitor()
-
+# El simulador corre en el bucle de eventos, así que comprobar su estado y
+# llamarlo no se intercala con otras peticiones: 409 si el estado no lo
+# permite, 500 si el simulador informa de un fallo
 @app.post("/api/simulation/start")
 async def start_simulation():
-    simulator.start_simulation()
-    monitor.start_monitoring()
+    if simulator.active:
+        raise HTTPException(status_code=409, detail="La simulación ya está en curso")
+    # El monitor ya está activo (ver lifespan): la ráfaga del cifrado activa el muestreo rápido
+    if not simulator.start_simulation():
+        raise HTTPException(status_code=500, detail="Error en simulación")
     return {"status": "started"}
 
 @app.post("/api/simulation/stop")
 async def stop_simulation():
-    simulator.stop_simulation()
-    monitor.stop_monitoring()
+    if not simulator.active:
+        raise HTTPException(status_code=409, detail="No hay simulación activa")
+    if not simulator.stop_simulation():
+        raise HTTPException(status_code=500, detail="Error al detener simulación")
     return {"status": "stopped"}
 
+@app.get("/api/simulation/backups")
+async def list_backups():
+    return simulator.list_backups()
+
+# Recorre y calcula hashes de los árboles: FastAPI ejecuta las funciones def en su pool de hilos
+@app.post("/api/simulation/verify")
+def verify_backup(backup: str = None):
+    try:
+        return simulator.verify_backup(backup)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @app.get("/api/metrics")
 async def get_metrics():
-    metrics = monitor.collect_metrics()
+    metrics = monitor.get_current_metrics()
     return metrics
 
+@app.get("/api/hosts")
+async def get_hosts():
+    return monitor.get_hosts()
+
+# Consulta bloqueante de SQLite: FastAPI ejecuta las funciones def en su pool de hilos
+@app.get("/api/metrics/history")
+def get_metrics_history(
+    from_: str = Query(None, alias="from"),
+    to: str = None,
+    points: int = Query(500, ge=0, le=10000),
+    field: str = "cpu_percent",
+    cursor: str = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    host: str = None
+):
+    try:
+        return monitor.get_metrics_history(from_, to, points, field, cursor, limit, host)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/events")
+def search_events(
+    type: str = None,
+    severity: str = None,
+    from_: str = Query(None, alias="from"),
+    to: str = None,
+    q: str = None,
+    order: str = "desc",
+    cursor: str = None,
+    limit: int = Query(100, ge=1, le=1000),
+    host: str = None
+):
+    try:
+        return monitor.search_events(type, severity, from_, to, q, order, cursor, limit, host)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/export")
+def export_data(incremental: bool = True):
+    report_path = simulator.backup_dir / "simulation_report.json"
+    reports = [str(report_path)] if report_path.exists() else []
+    summary = monitor.export_data(simulation_reports=reports, incremental=incremental)
+    if summary is None:
+        raise HTTPException(status_code=500, detail="Error al exportar datos")
+    return summary
+
 @app.post("/api/report/generate")
 async def generate_report():
     report = monitor.generate_report()
@@ -0,0 +1,232 @@
+# SecureSimLab - Buffer de Métricas
+# Archivo: metrics_buffer.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+from datetime import datetime
+import numpy as np
+
+class MetricsBuffer:
+    """
+    Buffer circular de capacidad fija para las métricas del sistema.
+    Almacena las muestras en un arreglo estructurado de NumPy, de modo que la
+    memoria se mantiene constante durante sesiones de monitoreo largas.
+
+    Está pensado para un único escritor (el hilo de monitoreo) y varios
+    lectores (API, GUI y detectores) que obtienen copias sin bloqueos.
+    """
+
+    # Campos numéricos de cada muestra (coinciden con la tabla system_metrics)
+    FIELDS = (
+        'cpu_percent',
+        'memory_percent',
+        'disk_io_read',
+        'disk_io_write',
+        'network_sent',
+        'network_recv'
+    )
+
+    # Campos que son contadores acumulados (bytes) y admiten cálculo de tasas
+    COUNTER_FIELDS = (
+        'disk_io_read',
+        'disk_io_write',
+        'network_sent',
+        'network_recv'
+    )
+
+    DTYPE = np.dtype([
+        ('timestamp', 'f8'),
+        ('cpu_percent', 'f8'),
+        ('memory_percent', 'f8'),
+        ('disk_io_read', 'f8'),
+        ('disk_io_write', 'f8'),
+        ('network_sent', 'f8'),
+        ('network_recv', 'f8')
+    ])
+
+    def __init__(self, capacity: int = 86400):
+        """
+        Inicializa el buffer circular.
+
+        Args:
+            capacity (int): Número máximo de muestras retenidas
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacidad inválida: {capacity}")
+
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=self.DTYPE)
+        # Total de muestras escritas desde el inicio (solo lo modifica el escritor)
+        self._written = 0
+        # Total de escrituras iniciadas; supera a _written mientras se escribe una fila
+        self._writing = 0
+
+    def __len__(self):
+        return min(self._written, self.capacity)
+
+    @staticmethod
+    def to_row(metrics):
+        """
+        Convierte el diccionario de collect_metrics() en una fila del buffer
+
+        Args:
+            metrics (dict): Métricas del sistema recolectadas
+        """
+        timestamp = metrics['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+
+        return (
+            timestamp,
+            metrics['cpu_percent'],
+            metrics['memory_percent'],
+            metrics['disk_io'].read_bytes,
+            metrics['disk_io'].write_bytes,
+            metrics['network'].bytes_sent,
+            metrics['network'].bytes_recv
+        )
+
+    def append(self, metrics):
+        """
+        Añade una muestra al buffer, sobrescribiendo la más antigua si está lleno
+
+        Args:
+            metrics (dict): Métricas del sistema recolectadas
+        """
+        index = self._written
+        # Anunciar la escritura antes de sobrescribir la fila más antigua
+        self._writing = index + 1
+        self._data[index % self.capacity] = self.to_row(metrics)
+        # Publicar la fila solo después de escribirla por completo
+        self._written = index + 1
+
+    def snapshot(self, count: int = None):
+        """
+        Devuelve una copia consistente del contenido, de la más antigua a la
+        más reciente, sin bloquear al escritor.
+
+        Las filas que el escritor haya podido sobrescribir durante la copia se
+        descartan, por lo que el resultado nunca mezcla muestras de vueltas
+        distintas del buffer.
+
+        Args:
+            count (int): Copiar solo las últimas muestras indicadas
+        """
+        while True:
+            start = self._written
+            first = max(0, start - self.capacity)
+            if count is not None:
+                first = max(first, start - count)
+
+            data = self._data[np.arange(first, start) % self.capacity]
+            end = self._writing
+
+            # Descartar solo las filas que una escritura iniciada haya podido sobrescribir
+            valid_from = max(first, end - self.capacity)
+            if valid_from < start or start == first:
+                return data[valid_from - first:]
+
+    def window(self, seconds: float = None, now: float = None):
+        """
+        Devuelve las muestras de los últimos segundos indicados
+
+        Args:
+            seconds (float): Tamaño de la ventana; None devuelve todo el buffer
+            now (float): Instante de referencia (epoch); por defecto la muestra más reciente
+        """
+        if seconds is None:
+            return self.snapshot()
+
+        # Copiar solo la cola necesaria, ampliándola hasta cubrir la ventana
+        count = 64
+        while True:
+            data = self.snapshot(count)
+            if not len(data):
+                return data
+            reference = data['timestamp'][-1] if now is None else now
+            if len(data) < count or data['timestamp'][0] < reference - seconds:
+                break
+            count *= 4
+
+        first = np.searchsorted(data['timestamp'], reference - seconds, side='left')
+        return data[first:]
+
+    def latest(self):
+        """Devuelve la muestra más reciente como diccionario, o None si está vacío"""
+        data = self.snapshot(1)
+        if not len(data):
+            return None
+
+        row = data[-1]
+        sample = {'timestamp': datetime.fromtimestamp(float(row['timestamp'])).isoformat()}
+        for field in self.FIELDS:
+            sample[field] = float(row[field])
+        return sample
+
+    def stats(self, field: str, seconds: float = None, percentiles=(50, 95, 99)):
+        """
+        Calcula estadísticas vectorizadas de un campo en la ventana indicada
+
+        Args:
+            field (str): Campo a analizar
+            seconds (float): Tamaño de la ventana en segundos
+            percentiles (tuple): Percentiles a calcular
+        """
+        self._validate_field(field)
+        values = self.window(seconds)[field]
+        if not len(values):
+            return None
+
+        stats = {
+            'count': int(len(values)),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(values.mean())
+        }
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            stats[f'p{p}'] = float(value)
+        return stats
+
+    def rates(self, field: str, seconds: float = None):
+        """
+        Devuelve las tasas por segundo entre muestras consecutivas de un contador
+
+        Args:
+            field (str): Campo contador (bytes acumulados)
+            seconds (float): Tamaño de la ventana en segundos
+        """
+        if field not in self.COUNTER_FIELDS:
+            raise ValueError(f"El campo no es un contador: {field}")
+
+        data = self.window(seconds)
+        if len(data) < 2:
+            return np.empty(0)
+
+        elapsed = np.diff(data['timestamp'])
+        deltas = np.diff(data[field])
+        valid = elapsed > 0
+        return deltas[valid] / elapsed[valid]
+
+    def rate(self, field: str, seconds: float = None):
+        """
+        Calcula la tasa media por segundo de un contador en la ventana indicada
+
+        Args:
+            field (str): Campo contador (bytes acumulados)
+            seconds (float): Tamaño de la ventana en segundos
+        """
+        if field not in self.COUNTER_FIELDS:
+            raise ValueError(f"El campo no es un contador: {field}")
+
+        data = self.window(seconds)
+        if len(data) < 2:
+            return 0.0
+
+        elapsed = data['timestamp'][-1] - data['timestamp'][0]
+        if elapsed <= 0:
+            return 0.0
+        return float((data[field][-1] - data[field][0]) / elapsed)
+
+    def _validate_field(self, field: str):
+        """Verifica que el campo exista en el buffer"""
+        if field not in self.FIELDS:
+            raise ValueError(f"Campo desconocido: {field}")
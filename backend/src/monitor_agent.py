@@ -0,0 +1,194 @@
+# SecureSimLab - Agente de Monitoreo
+# Archivo: monitor_agent.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import argparse
+import logging
+import socket
+import time
+import uuid
+import zlib
+from collections import deque
+from threading import Thread, Event
+
+try:
+    from .system_monitor import SystemMonitor
+    from .aggregator import FRAME_HEADER, MAX_FRAME_SIZE, encode_frame, decode_frame
+except ImportError:
+    from system_monitor import SystemMonitor
+    from aggregator import FRAME_HEADER, MAX_FRAME_SIZE, encode_frame, decode_frame
+
+class MonitorAgent:
+    """
+    Agente que monitorea el host local y envía sus métricas y eventos a un
+    MetricsAggregator por una conexión TCP persistente, en tramas comprimidas
+    por lotes. Mientras no hay conexión los registros se acumulan en un
+    buffer acotado y se reenvían al reconectar.
+    """
+
+    def __init__(self, monitor: SystemMonitor, aggregator_host: str = '127.0.0.1',
+                 aggregator_port: int = 8765, flush_interval: float = 1.0,
+                 batch_size: int = 500, max_pending: int = 100000):
+        """
+        Inicializa el agente.
+
+        Args:
+            monitor (SystemMonitor): Monitor local cuyos datos se envían
+            aggregator_host (str): Dirección del agregador
+            aggregator_port (int): Puerto del agregador
+            flush_interval (float): Segundos entre envíos
+            batch_size (int): Registros máximos por trama
+            max_pending (int): Registros retenidos sin conexión (se descartan los más antiguos)
+        """
+        self.monitor = monitor
+        self.aggregator = (aggregator_host, aggregator_port)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = deque(maxlen=max_pending)
+        # Lote enviado pero aún no confirmado; se reintenta tras reconectar
+        self.in_flight = []
+        # (session, seq) identifica cada trama: el agregador descarta los reenvíos ya guardados
+        self.session = uuid.uuid4().hex
+        self.seq = 0
+        self.sock = None
+        self.stop_event = Event()
+        self.sender = None
+        self.logger = logging.getLogger('MonitorAgent')
+        self.monitor.add_listener(self.enqueue)
+
+    def enqueue(self, kind: str, record):
+        """
+        Recibe los registros del monitor local
+
+        Args:
+            kind (str): 'metrics' o 'event'
+            record (dict): Muestra o evento
+        """
+        self.pending.append((kind, record))
+
+    def start(self):
+        """Inicia el monitoreo local y el envío al agregador"""
+        self.stop_event.clear()
+        self.monitor.start_monitoring()
+        self.sender = Thread(target=self.send_loop, daemon=True)
+        self.sender.start()
+        self.logger.info(f"Agente iniciado hacia {self.aggregator[0]}:{self.aggregator[1]}")
+
+    def stop(self):
+        """Detiene el monitoreo local y envía lo pendiente si hay conexión"""
+        self.monitor.stop_monitoring()
+        self.stop_event.set()
+        if self.sender:
+            self.sender.join()
+        self.disconnect()
+        self.logger.info("Agente detenido")
+
+    def send_loop(self):
+        """Hilo de envío: agrupa los registros pendientes y los envía periódicamente"""
+        backoff = self.flush_interval
+        while True:
+            stopping = self.stop_event.is_set()
+            try:
+                while self.in_flight or self.pending:
+                    self.flush()
+                backoff = self.flush_interval
+            except OSError as e:
+                self.logger.warning(f"Sin conexión con el agregador: {str(e)}")
+                self.disconnect()
+                if stopping:
+                    return
+                # Reintentar con espera exponencial acotada
+                backoff = min(backoff * 2, 30)
+                self.stop_event.wait(backoff)
+                continue
+
+            if stopping:
+                return
+            self.stop_event.wait(self.flush_interval)
+
+    def flush(self):
+        """Envía un lote y espera su confirmación"""
+        if not self.in_flight:
+            while self.pending and len(self.in_flight) < self.batch_size:
+                self.in_flight.append(self.pending.popleft())
+            self.seq += 1
+
+        if self.sock is None:
+            self.sock = socket.create_connection(self.aggregator, timeout=10)
+
+        frame = {
+            'session': self.session,
+            'seq': self.seq,
+            'host': self.monitor.host,
+            'metrics': [record for kind, record in self.in_flight if kind == 'metrics'],
+            'events': [record for kind, record in self.in_flight if kind == 'event']
+        }
+        self.sock.sendall(encode_frame(frame))
+
+        ack = self.receive()
+        if ack.get('ack') != self.seq:
+            raise OSError(f"Confirmación inesperada: {ack}")
+        self.in_flight = []
+
+    def receive(self):
+        """Lee una trama de la conexión con el agregador"""
+        header = self._read_exactly(FRAME_HEADER.size)
+        (size,) = FRAME_HEADER.unpack(header)
+        if size > MAX_FRAME_SIZE:
+            raise OSError(f"Trama demasiado grande: {size} bytes")
+        try:
+            return decode_frame(self._read_exactly(size))
+        except (ValueError, zlib.error) as e:
+            # Trama inválida: tratarla como un fallo de conexión y reintentar
+            raise OSError(f"Trama inválida del agregador: {str(e)}")
+
+    def _read_exactly(self, size: int):
+        """Lee exactamente size bytes del socket"""
+        data = b''
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise OSError("Conexión cerrada por el agregador")
+            data += chunk
+        return data
+
+    def disconnect(self):
+        """Cierra la conexión con el agregador"""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+def main():
+    """Ejecuta un agente desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Agente de monitoreo de SecureSimLab")
+    parser.add_argument('--aggregator', default='127.0.0.1:8765', help="host:puerto del agregador")
+    parser.add_argument('--host-name', default=None, help="Nombre con el que se etiqueta este host")
+    parser.add_argument('--db', default='data/agent.db', help="Base de datos local del agente")
+    parser.add_argument('--duration', type=float, default=None, help="Segundos a monitorear")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    aggregator_host, _, aggregator_port = args.aggregator.rpartition(':')
+    agent = MonitorAgent(
+        SystemMonitor(args.db, host=args.host_name),
+        aggregator_host,
+        int(aggregator_port)
+    )
+
+    agent.start()
+    try:
+        if args.duration is None:
+            while True:
+                time.sleep(1)
+        else:
+            time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+
+if __name__ == "__main__":
+    main()
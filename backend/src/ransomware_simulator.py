@@ -4,30 +4,45 @@
 
 import os
 import sys
+import time
 import logging
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.fernet import Fernet
 from pathlib import Path
 
+try:
+    from .integrity import IntegrityVerifier
+except ImportError:
+    from integrity import IntegrityVerifier
+
 class RansomwareSimulator:
     """
     Simulador educativo de ransomware para análisis de seguridad.
     Solo para uso en entornos controlados de laboratorio.
     """
     
-    def __init__(self, target_dir: str, backup_dir: str):
+    # Estrategias de cifrado: secuencial, en paralelo o limitada a una tasa de archivos
+    STRATEGIES = ('sequential', 'parallel', 'throttled')
+    
+    def __init__(self, target_dir: str, backup_dir: str, file_event_callback=None):
         """
         Inicializa el simulador con directorios específicos y medidas de seguridad.
         
         Args:
             target_dir (str): Directorio objetivo para la simulación
             backup_dir (str): Directorio para respaldos de seguridad
+            file_event_callback (callable): Función llamada tras procesar cada archivo
+                (por ejemplo SystemMonitor.record_file_event)
         """
         self.target_dir = Path(target_dir)
         self.backup_dir = Path(backup_dir)
+        self.file_event_callback = file_event_callback
         self.key = None
         self.active = False
+        self.encrypted_files = []
+        self.file_results = []
         self.setup_logging()
         self.validate_environment()
         
@@ -100,9 +115,12 @@ class RansomwareSimulator:
         Returns:
             bool: True si la simulación fue exitosa
         """
+        started = time.perf_counter()
+        size = 0
         try:
             with open(file_path, 'rb') as f:
                 data = f.read()
+            size = len(data)
             
             fernet = Fernet(self.key)
             encrypted_data = fernet.encrypt(data)
@@ -111,10 +129,12 @@ class RansomwareSimulator:
                 f.write(encrypted_data)
                 
             self.logger.info(f"Archivo simulado: {file_path}")
+            self.record_file_result(file_path, 'encrypt', size, started, True)
             return True
             
         except Exception as e:
             self.logger.error(f"Error en simulación de {file_path}: {str(e)}")
+            self.record_file_result(file_path, 'encrypt', size, started, False)
             return False
             
     def simulate_decryption(self, file_path: Path) -> bool:
@@ -127,9 +147,12 @@ class RansomwareSimulator:
         Returns:
             bool: True si la simulación fue exitosa
         """
+        started = time.perf_counter()
+        size = 0
         try:
             with open(file_path, 'rb') as f:
                 data = f.read()
+            size = len(data)
             
             fernet = Fernet(self.key)
             decrypted_data = fernet.decrypt(data)
@@ -138,18 +161,69 @@ class RansomwareSimulator:
                 f.write(decrypted_data)
                 
             self.logger.info(f"Archivo restaurado: {file_path}")
+            self.record_file_result(file_path, 'decrypt', size, started, True)
             return True
             
         except Exception as e:
             self.logger.error(f"Error en restauración de {file_path}: {str(e)}")
+            self.record_file_result(file_path, 'decrypt', size, started, False)
             return False
             
-    def start_simulation(self):
-        """Inicia la simulación del ransomware"""
+    def record_file_result(self, file_path: Path, operation: str, size: int,
+                           started: float, success: bool):
+        """
+        Registra el resultado de una operación sobre un archivo individual
+        
+        Args:
+            file_path (Path): Ruta del archivo
+            operation (str): 'encrypt' o 'decrypt'
+            size (int): Tamaño leído en bytes
+            started (float): Instante de inicio (time.perf_counter)
+            success (bool): Si la operación fue exitosa
+        """
+        self.file_results.append({
+            'timestamp': datetime.now().isoformat(),
+            'file': str(file_path),
+            'operation': operation,
+            'size': size,
+            'duration': time.perf_counter() - started,
+            'success': success
+        })
+        if self.file_event_callback:
+            self.file_event_callback()
+        
+    def save_simulation_report(self):
+        """Guarda el registro de archivos afectados y sus resultados por archivo"""
+        simulation_report = {
+            'timestamp': datetime.now().isoformat(),
+            'encrypted_files': self.encrypted_files,
+            'backup_location': str(self.backup_dir),
+            'file_results': self.file_results
+        }
+        
+        with open(self.backup_dir / 'simulation_report.json', 'w') as f:
+            json.dump(simulation_report, f, indent=4)
+            
+    def start_simulation(self, strategy: str = 'sequential', workers: int = 4,
+                         files_per_second: float = None):
+        """
+        Inicia la simulación del ransomware
+        
+        Args:
+            strategy (str): 'sequential', 'parallel' (varios hilos) o
+                'throttled' (como máximo files_per_second archivos por segundo)
+            workers (int): Hilos usados con la estrategia 'parallel'
+            files_per_second (float): Tasa máxima con la estrategia 'throttled'
+        """
         if self.active:
             self.logger.warning("La simulación ya está en curso")
             return False
             
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia de cifrado desconocida: {strategy}")
+        if strategy == 'throttled' and not files_per_second:
+            raise ValueError("La estrategia 'throttled' requiere files_per_second")
+            
         try:
             self.logger.info("Iniciando simulación...")
             self.active = True
@@ -161,21 +235,30 @@ class RansomwareSimulator:
             self.generate_key()
             
             # Simular cifrado
-            encrypted_files = []
-            for file_path in self.target_dir.rglob('*'):
-                if file_path.is_file():
-                    if self.simulate_encryption(file_path):
-                        encrypted_files.append(str(file_path))
+            self.encrypted_files = []
+            self.file_results = []
+            files = [path for path in self.target_dir.rglob('*') if path.is_file()]
+            
+            if strategy == 'parallel':
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(self.simulate_encryption, files))
+            else:
+                results = []
+                started = time.monotonic()
+                for index, file_path in enumerate(files):
+                    if strategy == 'throttled':
+                        # Espaciar los archivos sobre el reloj monotónico
+                        delay = started + index / files_per_second - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                    results.append(self.simulate_encryption(file_path))
+                    
+            self.encrypted_files = [
+                str(file_path) for file_path, success in zip(files, results) if success
+            ]
                         
             # Guardar registro de archivos afectados
-            simulation_report = {
-                'timestamp': datetime.now().isoformat(),
-                'encrypted_files': encrypted_files,
-                'backup_location': str(self.backup_dir)
-            }
-            
-            with open(self.backup_dir / 'simulation_report.json', 'w') as f:
-                json.dump(simulation_report, f, indent=4)
+            self.save_simulation_report()
                 
             self.logger.info("Simulación completada exitosamente")
             return True
@@ -199,6 +282,9 @@ class RansomwareSimulator:
                 if file_path.is_file():
                     self.simulate_decryption(file_path)
                     
+            # Añadir los resultados de la restauración al registro
+            self.save_simulation_report()
+            
             self.active = False
             self.logger.info("Simulación detenida y archivos restaurados")
             return True
@@ -207,6 +293,44 @@ class RansomwareSimulator:
             self.logger.error(f"Error al detener simulación: {str(e)}")
             return False
             
+    def list_backups(self):
+        """Devuelve los respaldos disponibles, del más antiguo al más reciente"""
+        return sorted(
+            path.name for path in self.backup_dir.glob('backup_*') if path.is_dir()
+        )
+        
+    def verify_backup(self, backup_name: str = None, workers: int = None):
+        """
+        Verifica que los archivos del directorio objetivo coinciden con un respaldo
+        
+        Args:
+            backup_name (str): Nombre del respaldo (backup_YYYYMMDD_HHMMSS); por defecto el más reciente
+            workers (int): Hilos usados para calcular los hashes
+            
+        Returns:
+            dict: Archivos coincidentes, distintos, faltantes y sobrantes
+        """
+        backups = self.list_backups()
+        if backup_name is None:
+            if not backups:
+                raise ValueError("No hay respaldos disponibles")
+            backup_name = backups[-1]
+        elif backup_name not in backups:
+            raise ValueError(f"Respaldo no encontrado: {backup_name}")
+            
+        verifier = IntegrityVerifier(str(self.backup_dir / 'hash_cache.db'), workers)
+        result = verifier.verify(self.target_dir, self.backup_dir / backup_name)
+        result['backup'] = backup_name
+        
+        if result['ok']:
+            self.logger.info(f"Integridad verificada contra {backup_name}")
+        else:
+            self.logger.warning(
+                f"Diferencias con {backup_name}: {len(result['mismatched'])} distintos, "
+                f"{len(result['missing'])} faltantes, {len(result['extra'])} sobrantes"
+            )
+        return result
+        
     def get_simulation_status(self):
         """Retorna el estado actual de la simulación"""
         return {
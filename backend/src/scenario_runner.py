@@ -0,0 +1,355 @@
+# SecureSimLab - Ejecución de Escenarios por Lotes
+# Archivo: scenario_runner.py
+# Este código es parte del proyecto SecureSimLab y está diseñado solo para propósitos educativos.
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import traceback
+from datetime import datetime
+from pathlib import Path
+from multiprocessing import Pool
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    from .ransomware_simulator import RansomwareSimulator
+    from .system_monitor import SystemMonitor
+except ImportError:
+    from ransomware_simulator import RansomwareSimulator
+    from system_monitor import SystemMonitor
+
+# Valores por defecto de cada escenario; 'defaults' en el archivo los sobrescribe
+DEFAULT_SCENARIO = {
+    'repeat': 1,
+    # Ejecutar en solitario, tras los demás: los detectores usan contadores de
+    # CPU y disco de todo el host, que la carga de otros escenarios falsea
+    'isolated': False,
+    'corpus': {
+        'files': 100,
+        'size': [1024, 65536],
+        'subdirs': 4,
+        'extensions': ['.txt', '.docx', '.pdf', '.jpg'],
+        'seed': 0
+    },
+    'encryption': {
+        'strategy': 'sequential',
+        'workers': 4,
+        'files_per_second': None
+    },
+    'durations': {
+        'warmup': 2,
+        'hold': 5,
+        'cooldown': 2
+    },
+    'monitor': {
+        'idle_interval': 1.0,
+        'burst_interval': 0.05,
+        'burst_hold': 5.0
+    }
+}
+
+def load_scenarios(path: str):
+    """
+    Lee las definiciones de escenarios de un archivo YAML o JSON
+
+    El archivo contiene una lista 'scenarios' y opcionalmente 'defaults';
+    cada escenario se combina con los valores por defecto y se expande
+    según su campo 'repeat'.
+
+    Args:
+        path (str): Ruta del archivo de escenarios
+    """
+    with open(path, 'r') as f:
+        if Path(path).suffix in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ValueError("Leer escenarios YAML requiere tener instalado PyYAML")
+            campaign = yaml.safe_load(f)
+        else:
+            campaign = json.load(f)
+
+    defaults = merge(DEFAULT_SCENARIO, campaign.get('defaults', {}))
+    scenarios = []
+    for index, definition in enumerate(campaign.get('scenarios', [])):
+        scenario = merge(defaults, definition)
+        scenario.setdefault('name', f'scenario_{index + 1}')
+        for run in range(scenario['repeat']):
+            expanded = dict(scenario)
+            expanded['run'] = run + 1
+            expanded['id'] = scenario['name'] if scenario['repeat'] == 1 else f"{scenario['name']}_{run + 1}"
+            scenarios.append(expanded)
+
+    ids = [scenario['id'] for scenario in scenarios]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Los nombres de escenario deben ser únicos")
+    return scenarios
+
+def merge(base, override):
+    """Combina dos diccionarios de configuración de forma recursiva"""
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+def generate_corpus(target_dir: Path, corpus):
+    """
+    Genera un conjunto de archivos reproducible a partir de una semilla
+
+    Args:
+        target_dir (Path): Directorio donde se crean los archivos
+        corpus (dict): files, size (bytes o [mín, máx]), subdirs, extensions y seed
+
+    Returns:
+        int: Bytes totales generados
+    """
+    rng = random.Random(corpus['seed'])
+    size = corpus['size']
+    low, high = (size, size) if isinstance(size, int) else size
+    subdirs = max(1, corpus['subdirs'])
+
+    total = 0
+    for index in range(corpus['files']):
+        directory = target_dir / f'dir_{index % subdirs:03d}'
+        os.makedirs(directory, exist_ok=True)
+        extension = corpus['extensions'][index % len(corpus['extensions'])]
+        length = rng.randint(low, high)
+        with open(directory / f'file_{index:06d}{extension}', 'wb') as f:
+            f.write(rng.randbytes(length))
+        total += length
+    return total
+
+def run_scenario(task):
+    """
+    Ejecuta un escenario en su propio directorio y base de datos
+
+    Se ejecuta en un proceso del pool; los logs del simulador y del monitor
+    se escriben dentro del directorio del escenario.
+
+    Args:
+        task (tuple): (escenario, directorio de salida de la campaña,
+            número de escenarios que se ejecutan a la vez)
+
+    Returns:
+        dict: Resultados del escenario
+    """
+    scenario, output_dir, concurrency = task
+    scenario_dir = Path(output_dir, scenario['id']).resolve()
+    result = {
+        'id': scenario['id'],
+        'name': scenario['name'],
+        'run': scenario['run'],
+        'concurrency': concurrency
+    }
+
+    try:
+        os.makedirs(scenario_dir / 'logs', exist_ok=True)
+        os.chdir(scenario_dir)
+        # Redirigir la salida de consola de este proceso al directorio del escenario
+        sys.stdout = sys.stderr = open(scenario_dir / 'console.log', 'w')
+
+        target_dir = scenario_dir / 'target'
+        corpus_bytes = generate_corpus(target_dir, scenario['corpus'])
+
+        monitor = SystemMonitor(str(scenario_dir / 'monitor.db'), **scenario['monitor'])
+        simulator = RansomwareSimulator(
+            str(target_dir), str(scenario_dir / 'backups'),
+            file_event_callback=monitor.record_file_event
+        )
+        durations = scenario['durations']
+        encryption = scenario['encryption']
+
+        monitor.start_monitoring()
+        try:
+            time.sleep(durations['warmup'])
+
+            started_at = datetime.now().isoformat()
+            started = time.perf_counter()
+            encrypted = simulator.start_simulation(
+                encryption['strategy'], encryption['workers'], encryption['files_per_second']
+            )
+            encryption_time = time.perf_counter() - started
+
+            time.sleep(durations['hold'])
+            # Leer antes de restaurar: el descifrado provoca otra ráfaga
+            burst_started_at = monitor.burst_started_at
+
+            started = time.perf_counter()
+            restored = simulator.stop_simulation()
+            restore_time = time.perf_counter() - started
+
+            time.sleep(durations['cooldown'])
+        finally:
+            monitor.stop_monitoring()
+
+        verification = simulator.verify_backup()
+
+        encrypt_results = [r for r in simulator.file_results if r['operation'] == 'encrypt']
+        encrypted_bytes = sum(r['size'] for r in encrypt_results if r['success'])
+
+        result.update({
+            'status': 'completed' if encrypted and restored else 'failed',
+            'strategy': encryption['strategy'],
+            'files': scenario['corpus']['files'],
+            'corpus_bytes': corpus_bytes,
+            'encrypted_files': len(simulator.encrypted_files),
+            'encryption_time': encryption_time,
+            'restore_time': restore_time,
+            'throughput_files_per_s': len(simulator.encrypted_files) / encryption_time if encryption_time else None,
+            'throughput_mb_per_s': encrypted_bytes / 1024 / 1024 / encryption_time if encryption_time else None,
+            'time_to_detect': first_detection(monitor.db_path, started_at),
+            'time_to_burst': seconds_between(started_at, burst_started_at)
+                if burst_started_at and burst_started_at >= started_at else None,
+            'restore_success': verification['ok'],
+            'restore_mismatched': len(verification['mismatched']),
+            'restore_missing': len(verification['missing']),
+            'restore_extra': len(verification['extra'])
+        })
+
+    except Exception as e:
+        result.update({
+            'status': 'error',
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        })
+
+    with open(scenario_dir / 'result.json', 'w') as f:
+        json.dump(result, f, indent=4)
+    return result
+
+def first_detection(db_path: str, started_at: str):
+    """Segundos desde el inicio del cifrado hasta el primer evento de seguridad"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT MIN(timestamp) FROM security_events WHERE timestamp >= ?
+        ''', (started_at,))
+        detected_at = cursor.fetchone()[0]
+    finally:
+        conn.close()
+    return seconds_between(started_at, detected_at) if detected_at else None
+
+def seconds_between(start: str, end: str):
+    """Diferencia en segundos entre dos timestamps ISO"""
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+def summarize(results, duration: float):
+    """
+    Resume los resultados de una campaña
+
+    Args:
+        results (list): Resultados de cada escenario
+        duration (float): Duración total de la campaña en segundos
+    """
+    completed = [r for r in results if r['status'] == 'completed']
+    detected = [r['time_to_detect'] for r in completed if r['time_to_detect'] is not None]
+    # Escenarios cuya detección pudo verse afectada por la carga de otros
+    concurrent = sorted(r['id'] for r in completed if r['concurrency'] > 1)
+
+    def mean(values):
+        values = [v for v in values if v is not None]
+        return sum(values) / len(values) if values else None
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'duration': duration,
+        'scenarios': len(results),
+        'completed': len(completed),
+        'failed': len(results) - len(completed),
+        'detected': len(detected),
+        'restore_success': sum(1 for r in completed if r['restore_success']),
+        'mean_time_to_detect': mean(detected),
+        'mean_throughput_mb_per_s': mean(r['throughput_mb_per_s'] for r in completed),
+        'concurrent_detection': concurrent,
+        'results': sorted(results, key=lambda r: r['id'])
+    }
+
+def run_campaign(scenarios, output_dir: str, workers: int = None):
+    """
+    Ejecuta los escenarios en paralelo, cada uno en un proceso nuevo; los
+    marcados como isolated se ejecutan después, de uno en uno
+
+    Args:
+        scenarios (list): Escenarios expandidos (ver load_scenarios)
+        output_dir (str): Directorio de la campaña
+        workers (int): Procesos simultáneos; por defecto el número de CPUs
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_dir = os.path.abspath(output_dir)
+    started = time.perf_counter()
+
+    phases = [
+        ([s for s in scenarios if not s['isolated']], workers or os.cpu_count() or 1),
+        ([s for s in scenarios if s['isolated']], 1)
+    ]
+    results = []
+    for phase, processes in phases:
+        if not phase:
+            continue
+        processes = min(processes, len(phase))
+        tasks = [(scenario, output_dir, processes) for scenario in phase]
+
+        # maxtasksperchild=1: cada escenario arranca con un proceso y unos logs limpios
+        with Pool(processes=processes, maxtasksperchild=1) as pool:
+            for result in pool.imap_unordered(run_scenario, tasks):
+                print(f"[{len(results) + 1}/{len(scenarios)}] {result['id']}: {result['status']}")
+                results.append(result)
+
+    summary = summarize(results, time.perf_counter() - started)
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=4)
+    return summary
+
+def print_summary(summary):
+    """Muestra el resumen de la campaña como tabla"""
+    def fmt(value, pattern='{:.2f}'):
+        return '-' if value is None else pattern.format(value)
+
+    print(f"\n{'Escenario':<30} {'Estado':<10} {'Simult.':>7} {'MB/s':>8} {'Archivos/s':>11} {'Detección (s)':>14} {'Restaurado':>11}")
+    for r in summary['results']:
+        print(
+            f"{r['id']:<30} {r['status']:<10} {r['concurrency']:>7} {fmt(r.get('throughput_mb_per_s')):>8} "
+            f"{fmt(r.get('throughput_files_per_s'), '{:.1f}'):>11} "
+            f"{fmt(r.get('time_to_detect')):>14} {str(r.get('restore_success', '-')):>11}"
+        )
+    print(
+        f"\n{summary['completed']}/{summary['scenarios']} completados, "
+        f"{summary['restore_success']} restaurados correctamente, "
+        f"{summary['detected']} detectados en {summary['duration']:.1f} s"
+    )
+    if summary['concurrent_detection']:
+        print(
+            f"Aviso: {len(summary['concurrent_detection'])} escenarios se ejecutaron junto a otros; "
+            "los detectores usan contadores de CPU y disco de todo el host, por lo que su "
+            "tiempo de detección incluye la carga ajena. Use 'isolated: true' o --workers 1 "
+            "para medir la detección."
+        )
+
+def main():
+    """Ejecuta una campaña de escenarios desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Ejecución de escenarios de SecureSimLab sin interfaz")
+    parser.add_argument('scenarios', help="Archivo YAML o JSON con los escenarios")
+    parser.add_argument('--output', default=None, help="Directorio de la campaña")
+    parser.add_argument('--workers', type=int, default=None, help="Escenarios simultáneos")
+    args = parser.parse_args()
+
+    output_dir = args.output or os.path.join(
+        'data', 'campaigns', datetime.now().strftime('%Y%m%d_%H%M%S')
+    )
+    summary = run_campaign(load_scenarios(args.scenarios), output_dir, args.workers)
+    print_summary(summary)
+    print(f"Resumen guardado en {os.path.join(output_dir, 'summary.json')}")
+    raise SystemExit(0 if summary['failed'] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -44,8 +44,11 @@ class SimulatorGUI:
         os.makedirs(self.backup_dir, exist_ok=True)
         
         # Inicializar simulador y monitor
-        self.simulator = RansomwareSimulator(self.target_dir, self.backup_dir)
         self.monitor = SystemMonitor()
+        self.simulator = RansomwareSimulator(
+            self.target_dir, self.backup_dir,
+            file_event_callback=self.monitor.record_file_event
+        )
         
     def setup_gui(self):
         """Configura los elementos de la interfaz gráfica"""
@@ -118,39 +121,26 @@ class SimulatorGUI:
         self.cpu_ax = self.fig.add_subplot(121)
         self.memory_ax = self.fig.add_subplot(122)
         
-        # Inicializar datos
-        self.times = []
-        self.cpu_values = []
-        self.memory_values = []
-        
         # Crear canvas
         self.canvas = FigureCanvasTkAgg(self.fig, master=graphs_frame)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
         
-    def update_graphs(self, cpu_percent, memory_percent):
-        """Actualiza los gráficos con nuevos datos"""
-        current_time = datetime.now().strftime('%H:%M:%S')
-        self.times.append(current_time)
-        self.cpu_values.append(cpu_percent)
-        self.memory_values.append(memory_percent)
-        
-        # Mantener solo los últimos 60 valores
-        if len(self.times) > 60:
-            self.times.pop(0)
-            self.cpu_values.pop(0)
-            self.memory_values.pop(0)
+    def update_graphs(self):
+        """Actualiza los gráficos con los últimos 60 segundos del buffer del monitor"""
+        window = self.monitor.buffer.window(60)
+        times = [datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in window['timestamp']]
             
         # Actualizar gráficos
         self.cpu_ax.clear()
         self.memory_ax.clear()
         
-        self.cpu_ax.plot(self.times, self.cpu_values, 'b-')
+        self.cpu_ax.plot(times, window['cpu_percent'], 'b-')
         self.cpu_ax.set_title('Uso de CPU')
         self.cpu_ax.set_ylabel('Porcentaje')
         self.cpu_ax.tick_params(axis='x', rotation=45)
         
-        self.memory_ax.plot(self.times, self.memory_values, 'r-')
+        self.memory_ax.plot(times, window['memory_percent'], 'r-')
         self.memory_ax.set_title('Uso de Memoria')
         self.memory_ax.set_ylabel('Porcentaje')
         self.memory_ax.tick_params(axis='x', rotation=45)
@@ -164,23 +154,23 @@ class SimulatorGUI:
             return
             
         try:
-            # Obtener métricas actuales
-            metrics = self.monitor.collect_metrics()
+            # Obtener métricas actuales del buffer compartido
+            metrics = self.monitor.get_current_metrics()
             
             if metrics:
                 # Actualizar etiquetas
-                self.cpu_var.set(f"CPU: {metrics['cpu_percent']}%")
-                self.memory_var.set(f"Memoria: {metrics['memory_percent']}%")
+                self.cpu_var.set(f"CPU: {metrics['cpu_percent']:.1f}%")
+                self.memory_var.set(f"Memoria: {metrics['memory_percent']:.1f}%")
                 
-                disk_write_speed = metrics['disk_io'].write_bytes / 1024 / 1024
+                disk_write_speed = metrics['disk_io_write_rate'] / 1024 / 1024
                 self.disk_var.set(f"Disco: {disk_write_speed:.2f} MB/s")
                 
-                network_speed = (metrics['network'].bytes_sent + 
-                               metrics['network'].bytes_recv) / 1024 / 1024
+                network_speed = (metrics['network_sent_rate'] + 
+                               metrics['network_recv_rate']) / 1024 / 1024
                 self.network_var.set(f"Red: {network_speed:.2f} MB/s")
                 
                 # Actualizar gráficos
-                self.update_graphs(metrics['cpu_percent'], metrics['memory_percent'])
+                self.update_graphs()
                 
             # Programar próxima actualización
             self.root.after(1000, self.update_metrics)
@@ -198,12 +188,12 @@ class SimulatorGUI:
         """Inicia la simulación y el monitoreo"""
         try:
             if not self.running:
+                # Iniciar monitor antes del simulador para observar la ráfaga del cifrado
+                self.monitor.start_monitoring()
+                
                 # Iniciar simulador
                 self.simulator.start_simulation()
                 
-                # Iniciar monitor
-                self.monitor.start_monitoring()
-                
                 self.running = True
                 self.update_metrics()
                 
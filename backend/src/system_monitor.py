@@ -8,11 +8,22 @@ import time
 import json
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import islice
+from collections import deque
 from threading import Thread, Event
-from queue import Queue
 import sqlite3
 import os
+import math
+
+try:
+    from .metrics_buffer import MetricsBuffer
+    from .downsampling import lttb
+    from .columnar_export import ColumnarExporter
+except ImportError:
+    from metrics_buffer import MetricsBuffer
+    from downsampling import lttb
+    from columnar_export import ColumnarExporter
 
 class SystemMonitor:
     """
@@ -20,16 +31,102 @@ class SystemMonitor:
     Registra y analiza el comportamiento del sistema durante la simulación.
     """
     
-    def __init__(self, db_path: str = 'data/monitor.db'):
+    # Ventana (segundos) usada para calcular tasas de disco y red
+    RATE_WINDOW = 5
+    
+    # Filas leídas por consulta al recorrer rangos de la base de datos
+    CHUNK_SIZE = 5000
+    
+    # Tablas de agregados de system_metrics y segundos que cubre cada fila
+    METRICS_ROLLUPS = (
+        ('system_metrics_1m', 60),
+        ('system_metrics_1h', 3600)
+    )
+    
+    # Filas máximas que lee una consulta de histórico reducida
+    HISTORY_MAX_ROWS = 20000
+    
+    # Umbrales que activan el muestreo de alta frecuencia
+    BURST_DISK_RATE = 10 * 1024 * 1024  # bytes/s escritos en disco
+    BURST_FILE_EVENT_RATE = 20  # eventos de archivo por segundo
+    
+    # Factor con el que el intervalo vuelve al reposo tras una ráfaga
+    BURST_DECAY = 1.5
+    
+    # Intervalos de reposo sin muestras tras los que la última se considera obsoleta
+    STALE_INTERVALS = 3
+    
+    # Columnas exportadas de cada tabla y su tipo
+    EXPORT_COLUMNS = {
+        'system_metrics': [
+            ('id', 'int'),
+            ('timestamp', 'datetime'),
+            ('cpu_percent', 'float'),
+            ('memory_percent', 'float'),
+            ('disk_io_read', 'float'),
+            ('disk_io_write', 'float'),
+            ('network_sent', 'float'),
+            ('network_recv', 'float'),
+            ('host', 'str')
+        ],
+        'security_events': [
+            ('id', 'int'),
+            ('timestamp', 'datetime'),
+            ('event_type', 'str'),
+            ('description', 'str'),
+            ('severity', 'str'),
+            ('host', 'str')
+        ],
+        'file_results': [
+            ('timestamp', 'datetime'),
+            ('file', 'str'),
+            ('operation', 'str'),
+            ('size', 'int'),
+            ('duration', 'float'),
+            ('success', 'bool')
+        ]
+    }
+    
+    def __init__(self, db_path: str = 'data/monitor.db', buffer_capacity: int = 86400,
+                 host: str = None, idle_interval: float = 1.0,
+                 burst_interval: float = 0.05, burst_hold: float = 5.0):
         """
         Inicializa el sistema de monitoreo.
         
         Args:
             db_path (str): Ruta para la base de datos de monitoreo
+            buffer_capacity (int): Número de muestras retenidas en memoria
+            host (str): Nombre con el que se etiquetan los datos locales
+            idle_interval (float): Segundos entre muestras en reposo
+            burst_interval (float): Segundos entre muestras durante una ráfaga de actividad
+            burst_hold (float): Segundos que se mantiene la alta frecuencia tras la última actividad
         """
         self.db_path = db_path
+        self.host = host or platform.node()
         self.monitoring = False
-        self.data_queue = Queue()
+        self.worker = None
+        self.buffer = MetricsBuffer(buffer_capacity)
+        self.fts_enabled = False
+        self.listeners = []
+        
+        # Muestreo adaptativo
+        self.idle_interval = idle_interval
+        self.burst_interval = burst_interval
+        self.burst_hold = burst_hold
+        self.sampling_interval = idle_interval
+        self.burst_until = 0.0
+        self.burst_started_at = None
+        self.file_events = 0
+        # Muestras aún no guardadas; acotadas como el buffer si la base de datos no acepta escrituras
+        self.pending_metrics = deque(maxlen=buffer_capacity)
+        self.last_events = {}
+        self.sampler_stats = {
+            'samples': 0,
+            'late_samples': 0,
+            'dropped_samples': 0,
+            'overhead_ms': 0.0,
+            'overhead_cpu_ms': 0.0
+        }
         self.stop_event = Event()
         self.setup_logging()
         self.setup_database()
@@ -71,7 +168,9 @@ class SystemMonitor:
                     disk_io_read REAL,
                     disk_io_write REAL,
                     network_sent REAL,
-                    network_recv REAL
+                    network_recv REAL,
+                    host TEXT,
+                    epoch REAL
                 )
             ''')
             
@@ -82,10 +181,84 @@ class SystemMonitor:
                     timestamp DATETIME,
                     event_type TEXT,
                     description TEXT,
-                    severity TEXT
+                    severity TEXT,
+                    host TEXT
+                )
+            ''')
+            
+            # Última trama guardada de cada sesión de agente, para no repetir reenvíos
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS agent_sessions (
+                    host TEXT,
+                    session TEXT,
+                    last_seq INTEGER,
+                    PRIMARY KEY (host, session)
                 )
             ''')
             
+            # Bases de datos anteriores a la agregación multi-nodo: etiquetar con el host local
+            for table in ('system_metrics', 'security_events'):
+                cursor.execute(f'PRAGMA table_info({table})')
+                if 'host' not in [column[1] for column in cursor.fetchall()]:
+                    cursor.execute(f'ALTER TABLE {table} ADD COLUMN host TEXT')
+                    cursor.execute(f'UPDATE {table} SET host = ?', (self.host,))
+                    
+            # Bases de datos anteriores al histórico por agregados: calcular el epoch de cada muestra
+            cursor.execute('PRAGMA table_info(system_metrics)')
+            if 'epoch' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE system_metrics ADD COLUMN epoch REAL')
+                cursor.execute('SELECT id, timestamp FROM system_metrics')
+                cursor.executemany('UPDATE system_metrics SET epoch = ? WHERE id = ?', [
+                    (datetime.fromisoformat(timestamp).timestamp(), row_id)
+                    for row_id, timestamp in cursor.fetchall()
+                ])
+            
+            # Índice para consultas por rango de tiempo y paginación por cursor
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp
+                ON system_metrics (timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_system_metrics_host_timestamp
+                ON system_metrics (host, timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_system_metrics_host_epoch
+                ON system_metrics (host, epoch)
+            ''')
+            
+            # Índices compuestos para filtrar eventos por tipo/severidad y tiempo.
+            # Incluyen tipo y severidad para que los conteos agregados no lean la tabla
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_security_events_timestamp
+                ON security_events (timestamp, event_type, severity)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_security_events_type_timestamp
+                ON security_events (event_type, timestamp, severity)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_security_events_severity_timestamp
+                ON security_events (severity, timestamp, event_type)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_security_events_type_severity_timestamp
+                ON security_events (event_type, severity, timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_security_events_host_timestamp
+                ON security_events (host, timestamp, event_type, severity)
+            ''')
+            
+            self.setup_metrics_rollups(cursor)
+            self.setup_event_counts(cursor)
+            self.setup_event_search(cursor)
+            
+            # Actualizar las estadísticas que usa el planificador para elegir
+            # índices; analysis_limit acota el coste en tablas grandes
+            cursor.execute('PRAGMA analysis_limit = 1000')
+            cursor.execute('ANALYZE')
+            
             conn.commit()
             conn.close()
             self.logger.info("Base de datos inicializada correctamente")
@@ -94,12 +267,192 @@ class SystemMonitor:
             self.logger.error(f"Error al configurar la base de datos: {str(e)}")
             raise
             
+    def setup_metrics_rollups(self, cursor):
+        """
+        Crea las tablas de agregados por minuto y por hora de system_metrics,
+        mantenidas por triggers, para reducir rangos largos del histórico sin
+        leer cada muestra. Guardan la suma de las métricas instantáneas y el
+        máximo (último valor) de los contadores acumulados.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor de la conexión en uso
+        """
+        gauges = [f for f in MetricsBuffer.FIELDS if f not in MetricsBuffer.COUNTER_FIELDS]
+        counters = list(MetricsBuffer.COUNTER_FIELDS)
+        columns = ', '.join(
+            ['samples', 'epoch_sum'] + [f'{f}_sum' for f in gauges] + [f'{f}_max' for f in counters]
+        )
+        
+        for table, size in self.METRICS_ROLLUPS:
+            cursor.execute('''
+                SELECT COUNT(*) FROM sqlite_master WHERE name = ?
+            ''', (table,))
+            exists = cursor.fetchone()[0]
+            
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    host TEXT,
+                    bucket INTEGER,
+                    samples INTEGER,
+                    epoch_sum REAL,
+                    {', '.join(f'{f}_sum REAL' for f in gauges)},
+                    {', '.join(f'{f}_max REAL' for f in counters)},
+                    PRIMARY KEY (host, bucket)
+                )
+            ''')
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_insert
+                AFTER INSERT ON system_metrics BEGIN
+                    INSERT INTO {table} (host, bucket, {columns})
+                    VALUES (
+                        new.host, CAST(new.epoch / {size} AS INTEGER) * {size}, 1, new.epoch,
+                        {', '.join(f'new.{f}' for f in gauges + counters)}
+                    )
+                    ON CONFLICT (host, bucket) DO UPDATE SET
+                        samples = samples + 1,
+                        epoch_sum = epoch_sum + excluded.epoch_sum,
+                        {', '.join(f'{f}_sum = {f}_sum + excluded.{f}_sum' for f in gauges)},
+                        {', '.join(f'{f}_max = MAX({f}_max, excluded.{f}_max)' for f in counters)};
+                END
+            ''')
+            
+            # Agregar las muestras registradas antes de existir la tabla
+            if not exists:
+                cursor.execute(f'''
+                    INSERT INTO {table} (host, bucket, {columns})
+                    SELECT host, CAST(epoch / {size} AS INTEGER) * {size}, COUNT(*), SUM(epoch),
+                           {', '.join([f'SUM({f})' for f in gauges] + [f'MAX({f})' for f in counters])}
+                    FROM system_metrics
+                    WHERE epoch IS NOT NULL
+                    GROUP BY host, CAST(epoch / {size} AS INTEGER)
+                ''')
+                
+    def setup_event_counts(self, cursor):
+        """
+        Crea la tabla de conteos de eventos por tipo, severidad, host y hora,
+        sincronizada con security_events mediante triggers, para que los
+        conteos agregados de search_events no recorran los eventos
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor de la conexión en uso
+        """
+        cursor.execute('''
+            SELECT COUNT(*) FROM sqlite_master WHERE name = 'security_event_counts'
+        ''')
+        exists = cursor.fetchone()[0]
+        
+        # bucket: hora del evento como prefijo ISO 'YYYY-MM-DDTHH'
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS security_event_counts (
+                event_type TEXT,
+                severity TEXT,
+                host TEXT,
+                bucket TEXT,
+                count INTEGER,
+                PRIMARY KEY (event_type, severity, host, bucket)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_event_counts_insert
+            AFTER INSERT ON security_events BEGIN
+                INSERT INTO security_event_counts (event_type, severity, host, bucket, count)
+                VALUES (new.event_type, new.severity, new.host, substr(new.timestamp, 1, 13), 1)
+                ON CONFLICT (event_type, severity, host, bucket) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_event_counts_delete
+            AFTER DELETE ON security_events BEGIN
+                UPDATE security_event_counts SET count = count - 1
+                WHERE event_type IS old.event_type AND severity IS old.severity
+                  AND host IS old.host AND bucket = substr(old.timestamp, 1, 13);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_event_counts_update
+            AFTER UPDATE OF event_type, severity, host, timestamp ON security_events BEGIN
+                UPDATE security_event_counts SET count = count - 1
+                WHERE event_type IS old.event_type AND severity IS old.severity
+                  AND host IS old.host AND bucket = substr(old.timestamp, 1, 13);
+                INSERT INTO security_event_counts (event_type, severity, host, bucket, count)
+                VALUES (new.event_type, new.severity, new.host, substr(new.timestamp, 1, 13), 1)
+                ON CONFLICT (event_type, severity, host, bucket) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        
+        # Contar los eventos registrados antes de existir la tabla
+        if not exists:
+            cursor.execute('''
+                INSERT INTO security_event_counts (event_type, severity, host, bucket, count)
+                SELECT event_type, severity, host, substr(timestamp, 1, 13), COUNT(*)
+                FROM security_events
+                GROUP BY event_type, severity, host, substr(timestamp, 1, 13)
+            ''')
+            
+    def setup_event_search(self, cursor):
+        """
+        Crea el índice de texto completo (FTS5) sobre la descripción de los
+        eventos, sincronizado con security_events mediante triggers
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor de la conexión en uso
+        """
+        cursor.execute('''
+            SELECT COUNT(*) FROM sqlite_master WHERE name = 'security_events_fts'
+        ''')
+        exists = cursor.fetchone()[0]
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS security_events_fts
+                USING fts5(description, content='security_events', content_rowid='id')
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite compilado sin FTS5: la búsqueda de texto usará LIKE
+            self.fts_enabled = False
+            self.logger.warning(f"FTS5 no disponible, búsqueda de texto sin índice: {str(e)}")
+            return
+            
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_events_fts_insert
+            AFTER INSERT ON security_events BEGIN
+                INSERT INTO security_events_fts (rowid, description)
+                VALUES (new.id, new.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_events_fts_delete
+            AFTER DELETE ON security_events BEGIN
+                INSERT INTO security_events_fts (security_events_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS security_events_fts_update
+            AFTER UPDATE ON security_events BEGIN
+                INSERT INTO security_events_fts (security_events_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+                INSERT INTO security_events_fts (rowid, description)
+                VALUES (new.id, new.description);
+            END
+        ''')
+        
+        # Indexar los eventos registrados antes de existir el índice
+        if not exists:
+            cursor.execute('''
+                INSERT INTO security_events_fts (security_events_fts) VALUES ('rebuild')
+            ''')
+            
+        self.fts_enabled = True
+        
     def collect_metrics(self):
         """Recolecta métricas del sistema"""
         try:
             metrics = {
                 'timestamp': datetime.now().isoformat(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
+                'cpu_percent': psutil.cpu_percent(interval=None),
                 'memory_percent': psutil.virtual_memory().percent,
                 'disk_io': psutil.disk_io_counters(),
                 'network': psutil.net_io_counters()
@@ -110,17 +463,421 @@ class SystemMonitor:
             self.logger.error(f"Error al recolectar métricas: {str(e)}")
             return None
             
-    def analyze_behavior(self, metrics):
+    def get_current_metrics(self):
+        """
+        Devuelve la muestra más reciente del buffer junto con las tasas de
+        disco y red (bytes/s), o None si aún no hay muestras. La muestra se
+        marca como obsoleta (stale) si el monitoreo está detenido o hace más
+        de STALE_INTERVALS intervalos de reposo que no hay muestras nuevas.
         """
-        Analiza el comportamiento del sistema basado en las métricas recolectadas
+        metrics = self.buffer.latest()
+        if metrics is None:
+            return None
+            
+        age = time.time() - datetime.fromisoformat(metrics['timestamp']).timestamp()
+        metrics['age_seconds'] = age
+        metrics['stale'] = not self.monitoring or age > self.STALE_INTERVALS * self.idle_interval
+        for field in MetricsBuffer.COUNTER_FIELDS:
+            metrics[f'{field}_rate'] = self.buffer.rate(field, self.RATE_WINDOW)
+        metrics.update(self.get_sampler_stats())
+        return metrics
+        
+    def get_sampler_stats(self):
+        """
+        Devuelve la frecuencia de muestreo actual y el coste del propio
+        monitor: tiempo real y de CPU por muestra (media móvil) y porcentaje
+        del intervalo que consume
+        """
+        stats = self.sampler_stats
+        return {
+            'sampling_rate_hz': 1 / self.sampling_interval,
+            'sampling_mode': 'burst' if self.sampling_interval < self.idle_interval else 'idle',
+            'burst_started_at': self.burst_started_at,
+            'monitor_samples': stats['samples'],
+            'monitor_late_samples': stats['late_samples'],
+            'monitor_dropped_samples': stats['dropped_samples'],
+            'monitor_overhead_ms': stats['overhead_ms'],
+            'monitor_overhead_cpu_ms': stats['overhead_cpu_ms'],
+            'monitor_overhead_percent': stats['overhead_ms'] / 10 / self.sampling_interval
+        }
+        
+    def record_file_event(self, count: int = 1):
+        """
+        Registra actividad de archivos observada fuera del monitor (por
+        ejemplo, el simulador); una tasa alta activa el muestreo rápido
+        
+        Args:
+            count (int): Número de eventos de archivo
+        """
+        self.file_events += count
+        
+    @staticmethod
+    def flatten_metrics(metrics):
+        """
+        Convierte el diccionario de collect_metrics() en una muestra plana con
+        las mismas columnas que la tabla system_metrics
+        
+        Args:
+            metrics (dict): Métricas del sistema recolectadas
+        """
+        return {
+            'timestamp': metrics['timestamp'],
+            'cpu_percent': metrics['cpu_percent'],
+            'memory_percent': metrics['memory_percent'],
+            'disk_io_read': metrics['disk_io'].read_bytes,
+            'disk_io_write': metrics['disk_io'].write_bytes,
+            'network_sent': metrics['network'].bytes_sent,
+            'network_recv': metrics['network'].bytes_recv
+        }
+        
+    def store_metrics(self, metrics):
+        """
+        Encola una muestra para la tabla system_metrics; se escribe en lote
+        con flush_metrics() para no abrir una transacción por muestra
         
         Args:
             metrics (dict): Métricas del sistema recolectadas
         """
         try:
+            sample = self.flatten_metrics(metrics)
+            if len(self.pending_metrics) == self.pending_metrics.maxlen:
+                # La cola está llena: se descarta la muestra pendiente más antigua
+                self.sampler_stats['dropped_samples'] += 1
+            self.pending_metrics.append(sample)
+            self.notify('metrics', sample)
+            
+        except Exception as e:
+            self.logger.error(f"Error al guardar métricas: {str(e)}")
+            
+    def flush_metrics(self):
+        """Guarda en la base de datos las muestras encoladas"""
+        if not self.pending_metrics:
+            return
+            
+        try:
+            self.ingest_batch(self.host, self.pending_metrics, [])
+            self.pending_metrics.clear()
+            
+        except Exception as e:
+            self.logger.error(
+                f"Error al guardar métricas ({len(self.pending_metrics)} pendientes; "
+                f"se descartan las más antiguas al superar {self.pending_metrics.maxlen}): {str(e)}"
+            )
+            
+    def ingest_batch(self, host: str, metrics, events, frame=None):
+        """
+        Inserta en una sola transacción un lote de muestras y eventos de un host
+        
+        Args:
+            host (str): Host de origen
+            metrics (list): Muestras planas (ver flatten_metrics)
+            events (list): Eventos con timestamp, event_type, description y severity
+            frame (tuple): (sesión, secuencia) de la trama de un agente; si esa
+                secuencia ya se guardó, el lote se descarta
+        
+        Returns:
+            bool: False si el lote era un reenvío ya guardado
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.cursor()
+            
+            if frame is not None:
+                # Cada sesión envía sus tramas en orden y espera la confirmación
+                # de cada una: basta con recordar la última secuencia guardada
+                session, seq = frame
+                cursor.execute('''
+                    SELECT last_seq FROM agent_sessions WHERE host = ? AND session = ?
+                ''', (host, session))
+                row = cursor.fetchone()
+                if row is not None and seq <= row[0]:
+                    return False
+                cursor.execute('''
+                    INSERT INTO agent_sessions (host, session, last_seq) VALUES (?, ?, ?)
+                    ON CONFLICT (host, session) DO UPDATE SET last_seq = excluded.last_seq
+                ''', (host, session, seq))
+                
+            cursor.executemany('''
+                INSERT INTO system_metrics 
+                (timestamp, cpu_percent, memory_percent, disk_io_read,
+                 disk_io_write, network_sent, network_recv, host, epoch)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    m['timestamp'], m['cpu_percent'], m['memory_percent'],
+                    m['disk_io_read'], m['disk_io_write'],
+                    m['network_sent'], m['network_recv'], host,
+                    datetime.fromisoformat(m['timestamp']).timestamp()
+                )
+                for m in metrics
+            ])
+            
+            cursor.executemany('''
+                INSERT INTO security_events 
+                (timestamp, event_type, description, severity, host)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (e['timestamp'], e['event_type'], e['description'], e['severity'], host)
+                for e in events
+            ])
+            
+            conn.commit()
+            return True
+            
+        finally:
+            conn.close()
+            
+    def add_listener(self, callback):
+        """
+        Registra una función que recibe cada muestra y evento generados localmente
+        
+        Args:
+            callback (callable): Función llamada como callback(kind, record),
+                con kind 'metrics' o 'event'
+        """
+        self.listeners.append(callback)
+        
+    def notify(self, kind: str, record):
+        """Entrega un registro local a los listeners registrados"""
+        for callback in self.listeners:
+            try:
+                callback(kind, record)
+            except Exception as e:
+                self.logger.error(f"Error en listener de monitoreo: {str(e)}")
+                
+    def get_hosts(self):
+        """Devuelve los hosts que han enviado métricas o eventos"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT host FROM system_metrics WHERE host IS NOT NULL
+                UNION
+                SELECT host FROM security_events WHERE host IS NOT NULL
+            ''')
+            return sorted(row[0] for row in cursor.fetchall())
+            
+        finally:
+            conn.close()
+            
+    def _iter_metrics(self, conn, host: str, start: str, end: str, after=None,
+                      chunk_size: int = None):
+        """
+        Recorre las filas de system_metrics de un host en el rango indicado
+        mediante paginación por cursor (timestamp, id), leyendo bloques de
+        tamaño fijo
+        
+        Args:
+            conn (sqlite3.Connection): Conexión abierta
+            host (str): Host de las métricas
+            start (str): Timestamp inicial (inclusivo)
+            end (str): Timestamp final (inclusivo)
+            after (tuple): Cursor (timestamp, id) exclusivo desde el que continuar
+            chunk_size (int): Filas por bloque; por defecto CHUNK_SIZE
+        """
+        cursor = conn.cursor()
+        chunk_size = min(chunk_size or self.CHUNK_SIZE, self.CHUNK_SIZE)
+        if after is None:
+            after = (start, 0)
+            
+        while True:
+            cursor.execute('''
+                SELECT id, timestamp, cpu_percent, memory_percent, disk_io_read,
+                       disk_io_write, network_sent, network_recv
+                FROM system_metrics
+                WHERE host = ? AND (timestamp, id) > (?, ?) AND timestamp <= ?
+                ORDER BY timestamp, id
+                LIMIT ?
+            ''', (host, after[0], after[1], end, chunk_size))
+            rows = cursor.fetchall()
+            
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
+            
+    def _count_metrics(self, conn, host: str, start: float, end: float, levels=None):
+        """
+        Cuenta las muestras de un host en el intervalo [start, end) de epoch
+        usando los agregados: las horas completas salen de la tabla horaria,
+        los minutos completos de los bordes de la tabla por minuto, y solo los
+        minutos incompletos de los extremos se cuentan en system_metrics
+        
+        Args:
+            conn (sqlite3.Connection): Conexión abierta
+            host (str): Host de las métricas
+            start (float): Epoch inicial (inclusivo)
+            end (float): Epoch final (exclusivo)
+            levels (tuple): Agregados aún disponibles, del más fino al más grueso
+        """
+        if levels is None:
+            levels = self.METRICS_ROLLUPS
+        cursor = conn.cursor()
+        
+        if not levels:
+            cursor.execute('''
+                SELECT COUNT(*) FROM system_metrics
+                WHERE host = ? AND epoch >= ? AND epoch < ?
+            ''', (host, start, end))
+            return cursor.fetchone()[0]
+            
+        table, size = levels[-1]
+        first_bucket = math.ceil(start / size) * size
+        end_bucket = math.floor(end / size) * size
+        if first_bucket >= end_bucket:
+            return self._count_metrics(conn, host, start, end, levels[:-1])
+            
+        cursor.execute(f'''
+            SELECT COALESCE(SUM(samples), 0) FROM {table}
+            WHERE host = ? AND bucket >= ? AND bucket < ?
+        ''', (host, first_bucket, end_bucket))
+        return (
+            cursor.fetchone()[0]
+            + self._count_metrics(conn, host, start, first_bucket, levels[:-1])
+            + self._count_metrics(conn, host, end_bucket, end, levels[:-1])
+        )
+        
+    def _history_rows(self, conn, host: str, first: float, last: float, raw_count: int):
+        """
+        Elige el nivel de detalle más fino que no supera HISTORY_MAX_ROWS
+        filas en el rango y devuelve sus filas como (epoch, timestamp, campos...)
+        
+        Returns:
+            tuple: (filas, segundos por fila o None si son muestras sin agregar)
+        """
+        cursor = conn.cursor()
+        if raw_count <= self.HISTORY_MAX_ROWS:
+            cursor.execute(f'''
+                SELECT epoch, timestamp, {', '.join(MetricsBuffer.FIELDS)}
+                FROM system_metrics
+                WHERE host = ? AND epoch >= ? AND epoch <= ?
+                ORDER BY epoch
+            ''', (host, first, last))
+            return cursor, None
+            
+        table, size = self.METRICS_ROLLUPS[-1]
+        for table, size in self.METRICS_ROLLUPS:
+            if (last - first) / size < self.HISTORY_MAX_ROWS:
+                break
+                
+        values = [
+            f'{f}_max' if f in MetricsBuffer.COUNTER_FIELDS else f'{f}_sum / samples'
+            for f in MetricsBuffer.FIELDS
+        ]
+        cursor.execute(f'''
+            SELECT epoch_sum / samples, NULL, {', '.join(values)}
+            FROM {table}
+            WHERE host = ? AND bucket >= ? AND bucket <= ?
+            ORDER BY bucket
+        ''', (host, math.floor(first / size) * size, last))
+        return cursor, size
+        
+    def get_metrics_history(self, start: str = None, end: str = None, points: int = 500,
+                            field: str = 'cpu_percent', cursor: str = None,
+                            limit: int = 1000, host: str = None):
+        """
+        Devuelve el histórico de métricas de un rango de tiempo.
+        
+        Con points > 0 el rango se reduce en el servidor con LTTB a como
+        máximo points muestras. Los rangos largos se leen de los agregados
+        por minuto u hora (ver resolution en la respuesta), de modo que el
+        coste no depende del número de muestras. Con points = 0 se devuelven
+        filas sin reducir, paginadas con un cursor "timestamp|id".
+        
+        Args:
+            start (str): Timestamp ISO inicial; por defecto el primero registrado
+            end (str): Timestamp ISO final; por defecto el último registrado
+            points (int): Número máximo de muestras devueltas (0 = sin reducir)
+            field (str): Métrica usada para elegir los puntos en la reducción
+            cursor (str): Cursor devuelto por la página anterior (solo con points = 0)
+            limit (int): Tamaño de página sin reducir
+            host (str): Host de las métricas; por defecto el local
+        """
+        if field not in MetricsBuffer.FIELDS:
+            raise ValueError(f"Campo desconocido: {field}")
+        if points and points < 3:
+            raise ValueError(f"Se necesitan al menos 3 puntos: {points}")
+            
+        start_epoch = datetime.fromisoformat(start).timestamp() if start else float('-inf')
+        end_epoch = datetime.fromisoformat(end).timestamp() if end else float('inf')
+        columns = ('timestamp',) + MetricsBuffer.FIELDS
+        host = host or self.host
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            query = conn.cursor()
+            bounds = []
+            for order in ('ASC', 'DESC'):
+                query.execute(f'''
+                    SELECT timestamp, epoch FROM system_metrics
+                    WHERE host = ? AND epoch >= ? AND epoch <= ?
+                    ORDER BY epoch {order}
+                    LIMIT 1
+                ''', (host, start_epoch, end_epoch))
+                bounds.append(query.fetchone())
+            first, last = bounds
+            
+            history = {
+                'host': host,
+                'from': first[0] if first else None,
+                'to': last[0] if last else None,
+                'raw_count': 0,
+                'downsampled': False,
+                'resolution': None,
+                'next_cursor': None,
+                'metrics': []
+            }
+            if first is None:
+                return history
+            history['raw_count'] = self._count_metrics(conn, host, first[1], math.nextafter(last[1], math.inf))
+                
+            if points:
+                rows, resolution = self._history_rows(conn, host, first[1], last[1], history['raw_count'])
+                history['resolution'] = resolution
+                if resolution is not None or history['raw_count'] > points:
+                    index = 2 + MetricsBuffer.FIELDS.index(field)
+                    rows = lttb(rows, points, first[1], last[1], lambda r: (r[0], r[index]))
+                    history['downsampled'] = True
+                history['metrics'] = [
+                    dict(zip(columns, (row[1] or datetime.fromtimestamp(row[0]).isoformat(),) + row[2:]))
+                    for row in rows
+                ]
+            else:
+                # Normalizar los límites: los timestamps ISO se ordenan lexicográficamente
+                start = datetime.fromisoformat(start).isoformat() if start else datetime.min.isoformat()
+                end = datetime.fromisoformat(end).isoformat() if end else datetime.max.isoformat()
+                after = None
+                if cursor:
+                    timestamp, _, row_id = cursor.rpartition('|')
+                    after = (timestamp, int(row_id))
+                rows = list(islice(self._iter_metrics(conn, host, start, end, after, limit + 1), limit + 1))
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    history['next_cursor'] = f"{rows[-1][1]}|{rows[-1][0]}"
+                history['metrics'] = [dict(zip(columns, row[1:])) for row in rows]
+                
+            return history
+            
+        finally:
+            conn.close()
+            
+    def analyze_behavior(self):
+        """
+        Analiza el comportamiento del sistema basado en las métricas del buffer
+        
+        Returns:
+            bool: True si algún detector se activó
+        """
+        detected = False
+        try:
+            metrics = self.buffer.latest()
+            if metrics is None:
+                return False
+                
             # Analizar uso de CPU
             if metrics['cpu_percent'] > 80:
-                self.log_security_event(
+                detected = True
+                self.report_detection(
                     'HIGH_CPU_USAGE',
                     f"Uso de CPU elevado: {metrics['cpu_percent']}%",
                     'WARNING'
@@ -128,16 +885,18 @@ class SystemMonitor:
                 
             # Analizar uso de memoria
             if metrics['memory_percent'] > 90:
-                self.log_security_event(
+                detected = True
+                self.report_detection(
                     'HIGH_MEMORY_USAGE',
                     f"Uso de memoria elevado: {metrics['memory_percent']}%",
                     'WARNING'
                 )
                 
             # Analizar actividad de disco
-            disk_write_speed = metrics['disk_io'].write_bytes / 1024 / 1024  # MB/s
+            disk_write_speed = self.buffer.rate('disk_io_write', self.RATE_WINDOW) / 1024 / 1024  # MB/s
             if disk_write_speed > 100:  # Más de 100 MB/s
-                self.log_security_event(
+                detected = True
+                self.report_detection(
                     'HIGH_DISK_ACTIVITY',
                     f"Actividad de disco elevada: {disk_write_speed:.2f} MB/s",
                     'WARNING'
@@ -146,6 +905,61 @@ class SystemMonitor:
         except Exception as e:
             self.logger.error(f"Error en análisis de comportamiento: {str(e)}")
             
+        return detected
+        
+    def report_detection(self, event_type: str, description: str, severity: str):
+        """
+        Registra un evento de un detector como mucho una vez por intervalo de
+        reposo, para que el muestreo rápido no multiplique los eventos
+        """
+        now = time.monotonic()
+        if now - self.last_events.get(event_type, float('-inf')) < self.idle_interval:
+            return
+        self.last_events[event_type] = now
+        self.log_security_event(event_type, description, severity)
+        
+    def detect_activity(self, elapsed: float, file_events: int):
+        """
+        Indica si la actividad reciente justifica el muestreo rápido
+        
+        Args:
+            elapsed (float): Segundos desde la muestra anterior
+            file_events (int): Eventos de archivo desde la muestra anterior
+        """
+        if elapsed > 0 and file_events / elapsed >= self.BURST_FILE_EVENT_RATE:
+            return True
+            
+        # Ventana corta para reaccionar rápido, con al menos dos muestras en reposo
+        window = max(2 * self.sampling_interval, 0.5)
+        return self.buffer.rate('disk_io_write', window) >= self.BURST_DISK_RATE
+        
+    def update_sampling_rate(self, active: bool):
+        """
+        Pasa a alta frecuencia cuando hay actividad y, pasado burst_hold sin
+        actividad, vuelve gradualmente al intervalo de reposo
+        
+        Args:
+            active (bool): Si la última muestra mostró actividad
+        """
+        now = time.monotonic()
+        if active:
+            if self.sampling_interval > self.burst_interval:
+                self.burst_started_at = datetime.now().isoformat()
+                self.logger.info("Actividad detectada: muestreo de alta frecuencia")
+            self.burst_until = now + self.burst_hold
+            self.sampling_interval = self.burst_interval
+        elif now >= self.burst_until and self.sampling_interval < self.idle_interval:
+            self.sampling_interval = min(self.sampling_interval * self.BURST_DECAY, self.idle_interval)
+            if self.sampling_interval == self.idle_interval:
+                self.logger.info("Actividad finalizada: muestreo en reposo")
+                
+    def record_overhead(self, elapsed: float, cpu_time: float):
+        """Actualiza la media móvil del coste por muestra del monitor"""
+        stats = self.sampler_stats
+        stats['samples'] += 1
+        stats['overhead_ms'] += 0.1 * (elapsed * 1000 - stats['overhead_ms'])
+        stats['overhead_cpu_ms'] += 0.1 * (cpu_time * 1000 - stats['overhead_cpu_ms'])
+            
     def log_security_event(self, event_type: str, description: str, severity: str):
         """
         Registra un evento de seguridad en la base de datos
@@ -156,35 +970,270 @@ class SystemMonitor:
             severity (str): Nivel de severidad
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO security_events 
-                (timestamp, event_type, description, severity)
-                VALUES (?, ?, ?, ?)
-            ''', (datetime.now().isoformat(), event_type, description, severity))
-            
-            conn.commit()
-            conn.close()
+            event = {
+                'timestamp': datetime.now().isoformat(),
+                'event_type': event_type,
+                'description': description,
+                'severity': severity
+            }
+            self.ingest_batch(self.host, [], [event])
+            self.notify('event', event)
             
             self.logger.info(f"Evento de seguridad registrado: {event_type}")
             
         except Exception as e:
             self.logger.error(f"Error al registrar evento: {str(e)}")
             
-    def monitor_thread(self):
-        """Hilo principal de monitoreo"""
+    def _count_events(self, conn, filters, params, start: str = None, end: str = None):
+        """
+        Cuenta los eventos por tipo, severidad y host en un rango de tiempo.
+        Las horas completas se suman de security_event_counts y solo las
+        horas incompletas de los extremos se cuentan en security_events.
+        
+        Args:
+            conn (sqlite3.Connection): Conexión abierta
+            filters (list): Condiciones sobre event_type, severity y host
+            params (list): Parámetros de las condiciones
+            start (str): Timestamp ISO inicial normalizado (inclusivo)
+            end (str): Timestamp ISO final normalizado (inclusivo)
+        
+        Returns:
+            list: Filas (event_type, severity, host, conteo)
+        """
+        cursor = conn.cursor()
+        
+        def count_raw(lower: str, upper: str, upper_op: str):
+            cursor.execute(f'''
+                SELECT event_type, severity, host, COUNT(*)
+                FROM security_events
+                WHERE {' AND '.join(filters + ['timestamp >= ?', f'timestamp {upper_op} ?'])}
+                GROUP BY event_type, severity, host
+            ''', params + [lower, upper])
+            return cursor.fetchall()
+            
+        # Horas completas: desde la primera hora que empieza en start o después
+        # hasta la hora que contiene end (excluida)
+        first_hour = end_hour = None
+        if start:
+            first = datetime.fromisoformat(start)
+            first_hour = first.replace(minute=0, second=0, microsecond=0)
+            if first_hour < first:
+                first_hour += timedelta(hours=1)
+        if end:
+            end_hour = datetime.fromisoformat(end).replace(minute=0, second=0, microsecond=0)
+        if first_hour and end_hour and first_hour >= end_hour:
+            return count_raw(start, end, '<=')
+            
+        conditions = list(filters)
+        bucket_params = list(params)
+        if first_hour:
+            conditions.append('bucket >= ?')
+            bucket_params.append(first_hour.strftime('%Y-%m-%dT%H'))
+        if end_hour:
+            conditions.append('bucket < ?')
+            bucket_params.append(end_hour.strftime('%Y-%m-%dT%H'))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor.execute(f'''
+            SELECT event_type, severity, host, SUM(count)
+            FROM security_event_counts
+            {where}
+            GROUP BY event_type, severity, host
+        ''', bucket_params)
+        groups = cursor.fetchall()
+        
+        if start and first_hour.isoformat() != start:
+            groups += count_raw(start, first_hour.isoformat(), '<')
+        if end:
+            groups += count_raw(end_hour.isoformat(), end, '<=')
+        return groups
+        
+    def search_events(self, event_type: str = None, severity: str = None,
+                      start: str = None, end: str = None, text: str = None,
+                      order: str = 'desc', cursor: str = None, limit: int = 100,
+                      host: str = None):
+        """
+        Busca eventos de seguridad con filtros, orden por tiempo y paginación
+        por cursor "timestamp|id". Cada página incluye los conteos agregados
+        de todos los eventos que cumplen el filtro; salen de
+        security_event_counts, salvo con búsqueda de texto, que cuenta los
+        eventos que coinciden con los términos solo en la primera página.
+        
+        Args:
+            event_type (str): Tipo de evento
+            severity (str): Nivel de severidad
+            start (str): Timestamp ISO inicial (inclusivo)
+            end (str): Timestamp ISO final (inclusivo)
+            text (str): Términos a buscar en la descripción
+            order (str): 'desc' (más recientes primero) o 'asc'
+            cursor (str): Cursor devuelto por la página anterior
+            limit (int): Tamaño de página
+            host (str): Host de origen; por defecto todos
+        """
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Orden inválido: {order}")
+            
+        # Filtros comunes a la página y a los conteos
+        filters = []
+        filter_params = []
+        if event_type:
+            filters.append('event_type = ?')
+            filter_params.append(event_type)
+        if severity:
+            filters.append('severity = ?')
+            filter_params.append(severity)
+        if host:
+            filters.append('host = ?')
+            filter_params.append(host)
+            
+        start = datetime.fromisoformat(start).isoformat() if start else None
+        end = datetime.fromisoformat(end).isoformat() if end else None
+        conditions = list(filters)
+        params = list(filter_params)
+        if start:
+            conditions.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            conditions.append('timestamp <= ?')
+            params.append(end)
+            
+        # Un texto solo con espacios no filtra (MATCH '' es un error de sintaxis FTS5)
+        text_search = bool(text and text.split())
+        if text_search:
+            if self.fts_enabled:
+                # Citar cada término para que no se interprete como sintaxis FTS5
+                terms = ' '.join('"{}"'.format(term.replace('"', '""')) for term in text.split())
+                conditions.append(
+                    'id IN (SELECT rowid FROM security_events_fts WHERE security_events_fts MATCH ?)'
+                )
+                params.append(terms)
+            else:
+                conditions.append('description LIKE ?')
+                params.append(f'%{text}%')
+                
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if cursor:
+            timestamp, _, event_id = cursor.rpartition('|')
+            comparison = '<' if order == 'desc' else '>'
+            page_conditions.append(f'(timestamp, id) {comparison} (?, ?)')
+            page_params.extend([timestamp, int(event_id)])
+            
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        page_where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ''
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            query = conn.cursor()
+            
+            query.execute(f'''
+                SELECT id, timestamp, event_type, description, severity, host
+                FROM security_events
+                {page_where}
+                ORDER BY timestamp {order}, id {order}
+                LIMIT ?
+            ''', page_params + [limit + 1])
+            rows = query.fetchall()
+            
+            # Los conteos por texto recorren las coincidencias: no se repiten al paginar
+            groups = None
+            if not text_search:
+                groups = self._count_events(conn, filters, filter_params, start, end)
+            elif cursor is None:
+                query.execute(f'''
+                    SELECT event_type, severity, host, COUNT(*)
+                    FROM security_events
+                    {where}
+                    GROUP BY event_type, severity, host
+                ''', params)
+                groups = query.fetchall()
+                
+        finally:
+            conn.close()
+            
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][1]}|{rows[-1][0]}"
+            
+        counts = None
+        if groups is not None:
+            counts = {'total': 0, 'by_type': {}, 'by_severity': {}, 'by_host': {}}
+            for group_type, group_severity, group_host, count in groups:
+                if not count:
+                    continue
+                counts['total'] += count
+                counts['by_type'][group_type] = counts['by_type'].get(group_type, 0) + count
+                counts['by_severity'][group_severity] = counts['by_severity'].get(group_severity, 0) + count
+                counts['by_host'][group_host] = counts['by_host'].get(group_host, 0) + count
+                
+        return {
+            'events': [
+                {
+                    'id': e[0],
+                    'timestamp': e[1],
+                    'type': e[2],
+                    'description': e[3],
+                    'severity': e[4],
+                    'host': e[5]
+                }
+                for e in rows
+            ],
+            'next_cursor': next_cursor,
+            'counts': counts
+        }
+        
+    def monitor_thread(self, file_events: int = 0):
+        """
+        Hilo principal de monitoreo. Programa cada muestra sobre el reloj
+        monotónico a partir de la anterior, de modo que el tiempo de trabajo
+        no acumula deriva; si se pierde un plazo, se reprograma desde ahora.
+        
+        Args:
+            file_events (int): Eventos de archivo contados al iniciar el monitoreo
+        """
+        # Primera lectura de referencia para cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        self.sampling_interval = self.idle_interval
+        next_sample = last_sample = last_flush = time.monotonic()
+        
         while not self.stop_event.is_set():
             try:
+                started = time.perf_counter()
+                cpu_started = time.thread_time()
+                
                 metrics = self.collect_metrics()
+                detected = False
                 if metrics:
-                    self.analyze_behavior(metrics)
-                    self.data_queue.put(metrics)
-                time.sleep(1)  # Intervalo de monitoreo
+                    self.buffer.append(metrics)
+                    self.store_metrics(metrics)
+                    detected = self.analyze_behavior()
+                    
+                now = time.monotonic()
+                new_file_events = self.file_events - file_events
+                file_events += new_file_events
+                active = self.detect_activity(now - last_sample, new_file_events)
+                self.update_sampling_rate(detected or active)
+                last_sample = now
+                
+                # Escribir en lote como mucho una vez por intervalo de reposo
+                if now - last_flush >= self.idle_interval:
+                    self.flush_metrics()
+                    last_flush = now
+                    
+                self.record_overhead(time.perf_counter() - started, time.thread_time() - cpu_started)
+                
+                next_sample += self.sampling_interval
+                now = time.monotonic()
+                if next_sample < now:
+                    self.sampler_stats['late_samples'] += 1
+                    next_sample = now
+                self.stop_event.wait(next_sample - now)
                 
             except Exception as e:
                 self.logger.error(f"Error en hilo de monitoreo: {str(e)}")
+                self.stop_event.wait(self.idle_interval)
+                
+        self.flush_metrics()
                 
     def start_monitoring(self):
         """Inicia el monitoreo del sistema"""
@@ -194,9 +1243,11 @@ class SystemMonitor:
             
         self.monitoring = True
         self.stop_event.clear()
-        self.monitor_thread = Thread(target=self.monitor_thread)
-        self.monitor_thread.daemon = True  # El hilo se detendrá cuando el programa principal termine
-        self.monitor_thread.start()
+        # Tomar la referencia aquí: los eventos posteriores, aunque lleguen
+        # antes de que arranque el hilo, cuentan para el muestreo rápido
+        self.worker = Thread(target=self.monitor_thread, args=(self.file_events,))
+        self.worker.daemon = True  # El hilo se detendrá cuando el programa principal termine
+        self.worker.start()
         self.logger.info("Monitoreo iniciado")
         
     def stop_monitoring(self):
@@ -205,10 +1256,70 @@ class SystemMonitor:
             return
             
         self.stop_event.set()
-        self.monitor_thread.join()
+        self.worker.join()
         self.monitoring = False
         self.logger.info("Monitoreo detenido")
         
+    def export_data(self, output_dir: str = 'data/exports', simulation_reports=None,
+                    incremental: bool = True, chunk_size: int = 50000):
+        """
+        Exporta system_metrics, security_events y los resultados por archivo del
+        simulador a formato columnar (Parquet si pyarrow está instalado, si no
+        arreglos .npy que pueden abrirse con memory-map).
+        
+        Args:
+            output_dir (str): Directorio de salida
+            simulation_reports (list): Rutas de simulation_report.json a incluir
+            incremental (bool): Exportar solo lo nuevo desde la última exportación
+            chunk_size (int): Filas leídas y escritas por bloque
+        """
+        try:
+            exporter = ColumnarExporter(output_dir, chunk_size)
+            if not incremental:
+                for table in self.EXPORT_COLUMNS:
+                    exporter.reset(table)
+                    
+            summary = {'format': exporter.format, 'output_dir': output_dir, 'rows': {}}
+            
+            conn = sqlite3.connect(self.db_path)
+            try:
+                for table in ('system_metrics', 'security_events'):
+                    summary['rows'][table] = exporter.export_table(
+                        conn, table, self.EXPORT_COLUMNS[table]
+                    )
+            finally:
+                conn.close()
+                
+            # Resultados por archivo: solo los posteriores al último exportado de cada reporte
+            exported = exporter.state.get('file_results', {})
+            exported_until = {}
+            records = []
+            for report_path in simulation_reports or []:
+                with open(report_path, 'r') as f:
+                    report = json.load(f)
+                    
+                key = str(Path(report_path).resolve())
+                new_results = [
+                    result for result in report.get('file_results', [])
+                    if result['timestamp'] > exported.get(key, '')
+                ]
+                if new_results:
+                    records.extend(new_results)
+                    exported_until[key] = max(result['timestamp'] for result in new_results)
+                    
+            summary['rows']['file_results'] = exporter.export_records(
+                'file_results', records, self.EXPORT_COLUMNS['file_results']
+            )
+            # Cada tabla guarda su progreso al completar su parte
+            exporter.state['file_results'] = {**exported, **exported_until}
+            exporter.save_state()
+            self.logger.info(f"Datos exportados en {output_dir}: {summary['rows']}")
+            return summary
+            
+        except Exception as e:
+            self.logger.error(f"Error al exportar datos: {str(e)}")
+            return None
+            
     def generate_report(self, output_file: str = 'data/reports/security_report.json'):
         """
         Genera un reporte de seguridad basado en los datos recolectados
@@ -238,6 +1349,26 @@ class SystemMonitor:
             ''')
             events = cursor.fetchall()
             
+            # Resumen por host de sus últimas 100 muestras
+            hosts_summary = {}
+            cursor.execute('''
+                SELECT DISTINCT host FROM system_metrics WHERE host IS NOT NULL
+            ''')
+            for (host,) in cursor.fetchall():
+                cursor.execute('''
+                    SELECT cpu_percent, memory_percent FROM system_metrics
+                    WHERE host = ?
+                    ORDER BY timestamp DESC
+                    LIMIT 100
+                ''', (host,))
+                host_metrics = cursor.fetchall()
+                hosts_summary[host] = {
+                    'total_records': len(host_metrics),
+                    'avg_cpu': sum(m[0] for m in host_metrics) / len(host_metrics),
+                    'avg_memory': sum(m[1] for m in host_metrics) / len(host_metrics),
+                    'security_events': sum(1 for e in events if e[5] == host)
+                }
+            
             conn.close()
             
             # Crear reporte
@@ -253,12 +1384,14 @@ class SystemMonitor:
                     'avg_cpu': sum(m[2] for m in metrics) / len(metrics) if metrics else 0,
                     'avg_memory': sum(m[3] for m in metrics) / len(metrics) if metrics else 0
                 },
+                'hosts': hosts_summary,
                 'security_events': [
                     {
                         'timestamp': e[1],
                         'type': e[2],
                         'description': e[3],
-                        'severity': e[4]
+                        'severity': e[4],
+                        'host': e[5]
                     }
                     for e in events
                 ]
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { SystemMetrics } from '../types/types';
+import { SystemMetrics, MetricsHistory, MetricsHistoryParams } from '../types/types';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000/api';
 
@@ -11,6 +11,8 @@ export const simulatorApi = {
   startSimulation: () => api.post('/simulation/start'),
   stopSimulation: () => api.post('/simulation/stop'),
   getMetrics: () => api.get<SystemMetrics>('/metrics'),
+  getMetricsHistory: (params: MetricsHistoryParams) =>
+    api.get<MetricsHistory>('/metrics/history', { params }),
   generateReport: () => api.post('/report/generate'),
   getLogs: () => api.get<string[]>('/logs'),
 };
\ No newline at end of file
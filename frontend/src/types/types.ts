@@ -11,4 +11,35 @@ export interface SystemMetrics {
     memory: number;
   }
   
+  export interface MetricsSample {
+    timestamp: string;
+    cpu_percent: number;
+    memory_percent: number;
+    disk_io_read: number;
+    disk_io_write: number;
+    network_sent: number;
+    network_recv: number;
+  }
+  
+  export interface MetricsHistoryParams {
+    from?: string;
+    to?: string;
+    points?: number;
+    field?: keyof Omit<MetricsSample, 'timestamp'>;
+    cursor?: string;
+    limit?: number;
+    host?: string;
+  }
+  
+  export interface MetricsHistory {
+    host: string;
+    from: string | null;
+    to: string | null;
+    raw_count: number;
+    downsampled: boolean;
+    resolution: number | null;
+    next_cursor: string | null;
+    metrics: MetricsSample[];
+  }
+  
   export type SimulationStatus = 'inactive' | 'active' | 'error';
\ No newline at end of file